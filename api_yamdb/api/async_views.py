@@ -0,0 +1,121 @@
+"""Асинхронные представления для чтения списков при запуске через ASGI.
+
+В Django 3.2 ASGI-сервер выполняет все синхронные представления в одном
+общем потоке, поэтому медленный запрос к базе или кешу задерживает всех
+остальных клиентов. Если включён ASYNC_VIEWS (его включает api_yamdb.asgi),
+GET-запросы к спискам каталога, отзывов и комментариев обрабатываются
+асинхронными представлениями:
+
+- ответ каталога из кеша собирается в цикле событий, в пуле потоков
+  выполняется только обращение к кешу, а цикл тем временем обслуживает
+  других клиентов;
+- остальные GET-запросы выполняются в пуле потоков вместе с рендерингом
+  ответа, у каждого потока своё соединение с базой;
+- запросы на запись, как и прежде, выполняются в общем потоке.
+
+Медленные клиенты поток не занимают: ответ им отправляет сервер, когда
+представление уже отработало.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from api.cache import make_key
+from api.conditional import etag_matches
+from api.instrumentation import record_cache
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def database_sync_to_async(func):
+    """Выполняет func в пуле потоков, как отдельный запрос к базе.
+
+    Соединение потока пула проверяется до и после вызова так же, как
+    Django делает это в начале и конце запроса: устаревшие и сломанные
+    соединения закрываются и не переходят к следующему вызову.
+    """
+    def inner(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(inner, thread_sensitive=False)
+
+
+cache_get = sync_to_async(cache.get, thread_sensitive=False)
+catalogue_key = sync_to_async(make_key, thread_sensitive=False)
+
+
+def render(view, request, *args, **kwargs):
+    response = view(request, *args, **kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+def accepts_json(request):
+    # Браузерам DRF отдаёт HTML-страницу API, её готовит само представление.
+    return (
+        'HTTP_AUTHORIZATION' not in request.META
+        and 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+    )
+
+
+async def cached_response(group, request):
+    """Отдаёт закешированный ответ каталога или None, если его нет."""
+    key = await catalogue_key(group, request)
+    if key is None:
+        return None
+    entry = await cache_get(key)
+    record_cache('catalogue', entry is not None)
+    if entry is None:
+        return None
+    data, headers = entry
+    if etag_matches(request, headers.get('ETag')):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(
+            JSONRenderer().render(data), content_type='application/json'
+        )
+    for header, value in headers.items():
+        response[header] = value
+    response['Vary'] = 'Accept'
+    return response
+
+
+def async_read_view(view):
+    """Оборачивает представление DRF в асинхронное для GET-запросов."""
+    group = getattr(view.cls, 'cache_group', None)
+    read = database_sync_to_async(functools.partial(render, view))
+    write = sync_to_async(view, thread_sensitive=True)
+
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await write(request, *args, **kwargs)
+        if group and request.method == 'GET' and accepts_json(request):
+            response = await cached_response(group, request)
+            if response is not None:
+                return response
+        return await read(request, *args, **kwargs)
+
+    return async_view
+
+
+class AsyncReadMixin:
+    """Делает список объектов асинхронным представлением при ASYNC_VIEWS."""
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if settings.ASYNC_VIEWS and actions and actions.get('get') == 'list':
+            view = async_read_view(view)
+        return view
@@ -0,0 +1,87 @@
+"""JWT-аутентификация без запроса к базе на каждый запрос.
+
+Токен, который выдаёт /auth/token/, содержит роль пользователя и версию его
+токенов. Сам пользователь берётся из кеша процесса с коротким сроком жизни
+(USER_CACHE_TIMEOUT), поэтому большинство запросов обходится без обращения
+к таблице пользователей. Смена роли увеличивает версию, а любое изменение
+или удаление пользователя убирает его из кеша, поэтому токены со старой
+ролью или версией перестают приниматься сразу в этом процессе и не позже
+чем через USER_CACHE_TIMEOUT секунд в остальных.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.instrumentation import record_cache
+from api.replicas import primary
+
+User = get_user_model()
+
+USER_CACHE = 'users'
+ROLE_CLAIM = 'role'
+VERSION_CLAIM = 'ver'
+
+
+def user_cache_key(user_id):
+    return f'user:{user_id}'
+
+
+def forget_user(user_id):
+    caches[USER_CACHE].delete(user_cache_key(user_id))
+
+
+class UserAccessToken(AccessToken):
+    """Токен доступа с ролью и версией токенов пользователя."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[ROLE_CLAIM] = user.role
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """Проверяет токен по закешированному состоянию пользователя.
+
+    Токены без роли и версии (например, выданные AccessToken.for_user)
+    принимаются, пока пользователь существует и активен.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатора пользователя.'
+            )
+        key = user_cache_key(user_id)
+        user = caches[USER_CACHE].get(key)
+        record_cache('users', user is not None)
+        if user is None:
+            # Из реплики могла бы прийти роль или версия токена до
+            # отзыва, и она осталась бы в кеше.
+            with primary():
+                user = User.objects.filter(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                ).first()
+            if user is None:
+                raise AuthenticationFailed(
+                    'Пользователь не найден.', code='user_not_found'
+                )
+            caches[USER_CACHE].set(key, user)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        if (
+            validated_token.get(ROLE_CLAIM, user.role) != user.role
+            or validated_token.get(VERSION_CLAIM, user.token_version)
+            != user.token_version
+        ):
+            raise AuthenticationFailed('Токен отозван.', code='token_revoked')
+        return user
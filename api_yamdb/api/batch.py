@@ -0,0 +1,165 @@
+"""Пакетное создание отзывов и комментариев.
+
+Каждый элемент пакета проверяется сериализатором по тем же правилам, что
+и в одиночных эндпоинтах. Существование произведений и отзывов и повторные
+отзывы автора проверяются одним запросом на весь пакет. Прошедшие проверку
+элементы вставляются bulk_create в одной транзакции, а статистика каждого
+затронутого произведения сдвигается одним UPDATE. Ответ - статус и данные
+или ошибки каждого элемента в порядке запроса.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from api.serializers import CommentBatchSerializer, ReviewBatchSerializer
+from api.throttling import (
+    WriteBatchIPThrottle, WriteBatchUserThrottle, scope_limit
+)
+from reviews.models import Comment, Review, Title
+from search.models import SearchDocument
+
+NON_FIELD_ERRORS = api_settings.NON_FIELD_ERRORS_KEY
+DUPLICATE_REVIEW = 'Вы уже оставили отзыв на это произведение.'
+CONFLICT = 'Данные изменились во время загрузки, повторите запрос.'
+
+
+def max_items():
+    """BATCH_WRITE_MAX_ITEMS, но не больше лимитов пакетной записи."""
+    limits = [settings.BATCH_WRITE_MAX_ITEMS] + [
+        scope_limit(throttle.scope)
+        for throttle in (WriteBatchIPThrottle, WriteBatchUserThrottle)
+    ]
+    return min(limit for limit in limits if limit is not None)
+
+
+def check_items(items):
+    limit = max_items()
+    if not isinstance(items, list) or not 1 <= len(items) <= limit:
+        raise ValidationError({NON_FIELD_ERRORS: [
+            f'Передайте список из 1-{limit} элементов.'
+        ]})
+
+
+def failure(code, errors):
+    return {'status': code, 'errors': errors}
+
+
+def validate(serializer_class, items):
+    """Возвращает список результатов (None для прошедших проверку) и пары
+    (номер элемента, validated_data)."""
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = serializer_class(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = failure(
+                status.HTTP_400_BAD_REQUEST, serializer.errors
+            )
+    return results, valid
+
+
+@contextmanager
+def atomic():
+    # Произведение или отзыв удалили, либо автор оставил отзыв, после
+    # проверки пакета.
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError:
+        raise ValidationError({NON_FIELD_ERRORS: [CONFLICT]})
+
+
+def insert(model, objects, author):
+    model.objects.bulk_create(objects)
+    if objects and not connection.features.can_return_rows_from_bulk_insert:
+        # SQLite не возвращает id из bulk_create. Транзакция, начавшая
+        # запись, держит блокировку всей базы до конца, поэтому последние
+        # строки автора - только что вставленные.
+        pks = list(
+            model.objects.filter(author=author).order_by('-pk')
+            .values_list('pk', flat=True)[:len(objects)]
+        )
+        for obj, pk in zip(objects, reversed(pks)):
+            obj.pk = pk
+
+
+def created(results, objects, serializer_class):
+    for index, obj in objects:
+        results[index] = {
+            'status': status.HTTP_201_CREATED,
+            'data': serializer_class(obj).data,
+        }
+    return results
+
+
+def create_reviews(items, author):
+    results, valid = validate(ReviewBatchSerializer, items)
+    title_ids = {data['title_id'] for _, data in valid}
+    titles = set(
+        Title.objects.filter(pk__in=title_ids).values_list('pk', flat=True)
+    )
+    reviewed = set(
+        Review.objects.filter(author=author, title_id__in=titles)
+        .values_list('title_id', flat=True)
+    )
+    reviews = []
+    stats = defaultdict(lambda: [0, 0])
+    for index, data in valid:
+        title_id = data['title_id']
+        if title_id not in titles:
+            results[index] = failure(
+                status.HTTP_404_NOT_FOUND,
+                {'title': ['Произведение не найдено.']},
+            )
+        elif title_id in reviewed:
+            results[index] = failure(
+                status.HTTP_400_BAD_REQUEST,
+                {NON_FIELD_ERRORS: [DUPLICATE_REVIEW]},
+            )
+        else:
+            reviewed.add(title_id)
+            reviews.append((index, Review(author=author, **data)))
+            stats[title_id][0] += data['score']
+            stats[title_id][1] += 1
+    if reviews:
+        objects = [review for _, review in reviews]
+        with atomic():
+            # Как и при одиночном создании, статистика сдвигается до
+            # вставки: UPDATE блокирует строки произведений.
+            for title_id, (score_sum, count) in sorted(stats.items()):
+                if not Title.apply_review_change(title_id, score_sum, count):
+                    raise IntegrityError
+            insert(Review, objects, author)
+            SearchDocument.index_new(objects)
+    return created(results, reviews, ReviewBatchSerializer)
+
+
+def create_comments(items, author):
+    results, valid = validate(CommentBatchSerializer, items)
+    review_titles = dict(
+        Review.objects.filter(
+            pk__in={data['review_id'] for _, data in valid}
+        ).values_list('pk', 'title_id')
+    )
+    comments = []
+    for index, data in valid:
+        if review_titles.get(data['review_id']) != data['title']:
+            results[index] = failure(
+                status.HTTP_404_NOT_FOUND,
+                {'review': ['Отзыв не найден.']},
+            )
+            continue
+        comments.append((index, Comment(
+            author=author, review_id=data['review_id'], text=data['text']
+        )))
+    if comments:
+        with atomic():
+            insert(Comment, [comment for _, comment in comments], author)
+    return created(results, comments, CommentBatchSerializer)
@@ -0,0 +1,107 @@
+"""Кеш ответов публичных эндпоинтов каталога.
+
+Ответы категорий, жанров и произведений не зависят от пользователя, поэтому
+кешируются по пути и нормализованной строке запроса. Кешируются только
+ответы в JSON: ETag зависит от формата, а асинхронные представления
+(api/async_views.py) отдают из кеша JSON. Ключи каждой группы
+содержат её текущую версию: чтобы сбросить кеш группы, достаточно сменить
+версию, не перебирая ключи. Версия случайная, поэтому вытеснение ключа
+версии из кеша не может вернуть к жизни старые страницы.
+"""
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.conditional import etag_matches
+from api.instrumentation import record_cache
+from api.replicas import primary
+
+CATEGORIES = 'categories'
+GENRES = 'genres'
+TITLES = 'titles'
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+CACHED_QUERY_PARAMS = frozenset(
+    ('category', 'genre', 'name', 'name_prefix', 'year', 'search', 'page')
+)
+
+
+def version_key(group):
+    return f'catalogue:{group}:version'
+
+
+def get_version(group):
+    version = cache.get(version_key(group))
+    if version is None:
+        version = uuid4().hex
+        cache.add(version_key(group), version, None)
+        version = cache.get(version_key(group), version)
+    return version
+
+
+def invalidate(*groups):
+    """Сбрасывает кеш групп после фиксации текущей транзакции."""
+    transaction.on_commit(lambda: cache.set_many(
+        {version_key(group): uuid4().hex for group in groups}, None
+    ))
+
+
+def make_key(group, request):
+    """Возвращает ключ кеша или None, если запрос кешировать нельзя.
+
+    Принимает как запрос DRF, так и HttpRequest Django.
+    """
+    if set(request.GET) - CACHED_QUERY_PARAMS:
+        return None
+    query = urlencode(sorted(
+        (name, value) for name in request.GET
+        for value in request.GET.getlist(name) if value
+    ))
+    return (
+        f'catalogue:{group}:{get_version(group)}:'
+        f'{request.get_host()}{request.path}?{query}'
+    )
+
+
+class CachedListMixin:
+    """Кеширует ответы на GET-запросы к списку объектов.
+
+    Вместе с данными сохраняются заголовки ETag и Last-Modified, чтобы
+    условный запрос получал 304 и при попадании в кеш.
+    """
+
+    cache_group = None
+
+    def cached(self, handler, request, *args, **kwargs):
+        key = make_key(self.cache_group, request)
+        if key is None or request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+        entry = cache.get(key)
+        record_cache('catalogue', entry is not None)
+        if entry is not None:
+            data, headers = entry
+            if etag_matches(request, headers.get('ETag')):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+            return Response(data, headers=headers)
+        # Закешированный ответ видят все клиенты, поэтому он строится по
+        # основной базе, а не по отстающей реплике.
+        with primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            headers = {
+                header: response[header]
+                for header in VALIDATOR_HEADERS if response.has_header(header)
+            }
+            cache.set(
+                key, (response.data, headers), settings.CATALOGUE_CACHE_TIMEOUT
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
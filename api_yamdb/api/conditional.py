@@ -0,0 +1,147 @@
+"""Условные GET-запросы: ETag, Last-Modified и ответ 304.
+
+ETag вычисляется до сериализации: по первичным ключам и датам изменения
+объектов страницы (и связанных объектов, попадающих в ответ), числу
+объектов и адресу запроса. Если клиент прислал совпадающий If-None-Match,
+ответ 304 возвращается без сериализации и рендеринга тела.
+
+Страницы от JSON_STREAMING_THRESHOLD объектов отдаются потоком, если
+рендерер это умеет (api/renderers.py).
+"""
+import hashlib
+from datetime import datetime
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.row_serializers import row_serializer
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header or not etag:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(etag, last_modified):
+    return set_validators(
+        Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified
+    )
+
+
+class ConditionalGetMixin:
+    """Добавляет ETag и Last-Modified к списку объектов.
+
+    etag_fields перечисляет поля, от которых зависит представление
+    объекта; в них можно указывать поля связанных моделей.
+    """
+
+    etag_fields = ('pk', 'updated_at')
+    # Сериализатор, по полям которого список строится из строк values()
+    # (api/row_serializers.py); None - обычная сериализация объектов.
+    row_serializer_class = None
+
+    def get_validators(self, objects, count=None, model=None):
+        rows = []
+        if objects:
+            model = model or type(objects[0])
+            rows = list(
+                model._default_manager
+                .filter(pk__in=[
+                    obj['pk'] if isinstance(obj, dict) else obj.pk
+                    for obj in objects
+                ])
+                .order_by(*self.etag_fields)
+                .values_list(*self.etag_fields)
+            )
+        request = self.request
+        fingerprint = repr((
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            count,
+            rows,
+        ))
+        etag = f'"{hashlib.md5(fingerprint.encode()).hexdigest()}"'
+        stamps = [
+            value for row in rows for value in row
+            if isinstance(value, datetime)
+        ]
+        return etag, max(stamps, default=None)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        if self.row_serializer_class:
+            queryset = row_serializer(self.row_serializer_class).rows(queryset)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            objects = list(queryset)
+            count = len(objects)
+        else:
+            objects = page
+            count = getattr(self.paginator, 'count', None)
+            paginator_page = getattr(self.paginator, 'page', None)
+            if count is None and paginator_page:
+                count = paginator_page.paginator.count
+        etag, last_modified = self.get_validators(objects, count, model)
+        if etag_matches(request, etag):
+            return not_modified(etag, last_modified)
+        if self.row_serializer_class:
+            data = row_serializer(self.row_serializer_class).serialize(objects)
+        else:
+            data = self.get_serializer(objects, many=True).data
+        response = (
+            Response(data) if page is None
+            else self.get_paginated_response(data)
+        )
+        # Ответы кешируемых представлений (api/cache.py) сохраняются в кеш
+        # вместе с response.data, поэтому потоком не отдаются.
+        if (
+            len(objects) >= settings.JSON_STREAMING_THRESHOLD
+            and not getattr(self, 'cache_group', None)
+        ):
+            response = self.stream_response(response)
+        return set_validators(response, etag, last_modified)
+
+    def stream_response(self, response):
+        renderer = self.request.accepted_renderer
+        media_type = self.request.accepted_media_type
+        context = {**self.get_renderer_context(), 'response': response}
+        if not hasattr(renderer, 'stream') or not renderer.can_stream(
+            media_type, context
+        ):
+            return response
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return StreamingHttpResponse(
+            renderer.stream(response.data, media_type, context),
+            status=response.status_code,
+            content_type=content_type,
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Добавляет ETag и Last-Modified к списку и отдельному объекту."""
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_validators((instance,))
+        if etag_matches(request, etag):
+            return not_modified(etag, last_modified)
+        return set_validators(
+            Response(self.get_serializer(instance).data), etag, last_modified
+        )
@@ -0,0 +1,16 @@
+from django_filters import rest_framework as filters
+
+from reviews.models import Title
+
+
+class TitleFilter(filters.FilterSet):
+    category = filters.CharFilter(field_name='category__slug')
+    genre = filters.CharFilter(field_name='genre__slug')
+    name = filters.CharFilter(field_name='name', lookup_expr='icontains')
+    name_prefix = filters.CharFilter(
+        field_name='name', lookup_expr='istartswith'
+    )
+
+    class Meta:
+        model = Title
+        fields = ('category', 'genre', 'name', 'name_prefix', 'year')
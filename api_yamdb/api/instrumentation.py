@@ -0,0 +1,163 @@
+"""Замеры каждого запроса: время, запросы к базе, кеш и размер ответа.
+
+Для доли запросов REQUEST_INSTRUMENTATION_SAMPLE_RATE InstrumentationMiddleware
+добавляет заголовок Server-Timing и пишет строку JSON в журнал
+api.instrumentation:
+
+    {"method": "GET", "path": "/api/v1/titles/", "route": "titles-list",
+     "status": 200, "total_ms": 12.4, "db_ms": 3.1, "queries": 3,
+     "duplicated": 0, "cache_hits": 0, "cache_misses": 1, "bytes": 2048}
+
+duplicated - число повторов одного и того же SQL (без учёта параметров):
+обычно это признак запросов в цикле. Попадания в кеш отмечают места, где
+приложение читает свои кеши (record_cache).
+
+Замеры текущего запроса хранятся в переменной контекста, поэтому
+учитываются и запросы к базе из потоков асинхронных представлений. Если
+доля равна нулю, middleware отключается при запуске и ничего не стоит.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api.metrics import count_cache
+
+logger = logging.getLogger(__name__)
+
+current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0
+        self.queries = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def duplicated(self):
+        return sum(count - 1 for count in self.queries.values())
+
+    def as_dict(self, request, response):
+        match = request.resolver_match
+        return {
+            'method': request.method,
+            'path': request.path,
+            'route': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 2),
+            'db_ms': round(self.db_time * 1000, 2),
+            'queries': sum(self.queries.values()),
+            'duplicated': self.duplicated,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'bytes': (
+                None if response.streaming else len(response.content)
+            ),
+        }
+
+
+def record_cache(cache, hit):
+    """Отмечает попадание в кеш приложения cache или промах."""
+    if settings.METRICS_ENABLED:
+        count_cache(cache, hit)
+    stats = current_stats.get()
+    if stats is None:
+        return
+    if hit:
+        stats.cache_hits += 1
+    else:
+        stats.cache_misses += 1
+
+
+def query_wrapper(execute, sql, params, many, context):
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - started
+        stats.queries[sql] += 1
+
+
+def install_query_wrapper(sender=None, connection=None, **kwargs):
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
+
+
+def server_timing(record):
+    return ', '.join((
+        f'total;dur={record["total_ms"]}',
+        f'db;dur={record["db_ms"]};desc="{record["queries"]} queries, '
+        f'{record["duplicated"]} duplicated"',
+        f'cache;desc="{record["cache_hits"]} hits, '
+        f'{record["cache_misses"]} misses"',
+    ))
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django отличает асинхронные middleware (см. MiddlewareMixin).
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        # Соединения потоков, открытые позже, получат обёртку из сигнала.
+        connection_created.connect(
+            install_query_wrapper, dispatch_uid='api.instrumentation'
+        )
+        for connection in connections.all():
+            install_query_wrapper(connection=connection)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self.finish(request, response, stats)
+
+    @staticmethod
+    def finish(request, response, stats):
+        record = stats.as_dict(request, response)
+        response['Server-Timing'] = server_timing(record)
+        logger.info(json.dumps(record, ensure_ascii=False))
+        return response
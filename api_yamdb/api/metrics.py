@@ -0,0 +1,374 @@
+"""Метрики в текстовом формате Prometheus для /metrics.
+
+MetricsMiddleware считает запросы по шаблону маршрута
+(/api/v1/titles/{title_id}/reviews/), методу и коду ответа и строит
+гистограммы их длительности. Кроме того, собираются длительность запросов
+к базе, число открытых и открывавшихся соединений и обращения к кешам
+приложения (record_cache в api/instrumentation.py).
+
+Значения копятся в словарях того потока, который обрабатывает запрос,
+поэтому запись не берёт блокировок: поток меняет только свои словари, а
+сборщик складывает их копии.
+
+С несколькими процессами (воркеры gunicorn или uvicorn) задайте общий
+каталог METRICS_DIR: каждый процесс не чаще раза в METRICS_FLUSH_INTERVAL
+секунд и при выходе записывает свои значения в файл <pid>.json, а /metrics
+складывает файлы всех процессов. Счётчики завершившихся процессов
+сохраняются, чтобы суммы не убывали, а текущие показатели (открытые
+соединения) берутся только у живых процессов. Каталог очищают перед
+запуском сервиса.
+"""
+import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1
+)
+# Тип, описание и границы корзин гистограммы.
+METRICS = {
+    'yamdb_http_requests_total': (
+        'counter', 'Обработанные запросы.', None
+    ),
+    'yamdb_http_request_duration_seconds': (
+        'histogram', 'Длительность обработки запроса.', REQUEST_BUCKETS
+    ),
+    'yamdb_db_query_duration_seconds': (
+        'histogram', 'Длительность запроса к базе.', QUERY_BUCKETS
+    ),
+    'yamdb_db_connections_opened_total': (
+        'counter', 'Открытые за всё время соединения с базой.', None
+    ),
+    'yamdb_db_connections': (
+        'gauge', 'Открытые сейчас соединения с базой.', None
+    ),
+    'yamdb_cache_requests_total': (
+        'counter', 'Обращения к кешам приложения.', None
+    ),
+}
+# Остальные методы считаются вместе, чтобы не плодить ряды.
+METHODS = frozenset(
+    ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+)
+ROUTE_PARAMETER = re.compile(r'\(\?P<(\w+)>[^)]*\)|<(?:\w+:)?(\w+)>')
+
+
+class Store:
+    """Значения одного потока: счётчики и ряды гистограмм."""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+_local = threading.local()
+# Хранилища всех потоков процесса; list.append атомарен.
+_stores = []
+# Соединения с базой процесса: id -> слабая ссылка.
+_connections = {}
+_next_flush = 0
+
+
+def local_store():
+    try:
+        return _local.store
+    except AttributeError:
+        store = _local.store = Store()
+        _stores.append(store)
+        return store
+
+
+def inc(name, labels, value=1):
+    counters = local_store().counters
+    counters[name, labels] = counters.get((name, labels), 0) + value
+
+
+def observe(name, labels, value):
+    histograms = local_store().histograms
+    buckets = METRICS[name][2]
+    series = histograms.get((name, labels))
+    if series is None:
+        # Корзины по границам, корзина +Inf и сумма значений.
+        series = histograms[name, labels] = [0] * (len(buckets) + 2)
+    series[bisect_left(buckets, value)] += 1
+    series[-1] += value
+
+
+def count_cache(cache, hit):
+    inc('yamdb_cache_requests_total', (
+        ('cache', cache), ('result', 'hit' if hit else 'miss')
+    ))
+
+
+def route_template(request):
+    """Шаблон маршрута запроса: /api/v1/titles/{title_id}/reviews/."""
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched'
+    route = ROUTE_PARAMETER.sub(
+        lambda parameter: '{%s}' % (parameter[1] or parameter[2]),
+        match.route,
+    )
+    for symbol, replacement in (('^', ''), ('$', ''), ('\\', ''), ('?', '')):
+        route = route.replace(symbol, replacement)
+    return '/' + route
+
+
+def query_timer(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        observe(
+            'yamdb_db_query_duration_seconds',
+            (('alias', context['connection'].alias),),
+            time.perf_counter() - started,
+        )
+
+
+def track_connection(connection):
+    _connections[id(connection)] = weakref.ref(connection)
+    if query_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_timer)
+
+
+def connection_opened(sender=None, connection=None, **kwargs):
+    track_connection(connection)
+    inc('yamdb_db_connections_opened_total', (('alias', connection.alias),))
+
+
+def open_connections():
+    counts = dict.fromkeys(settings.DATABASES, 0)
+    for key, reference in list(_connections.items()):
+        connection = reference()
+        if connection is None:
+            _connections.pop(key, None)
+        elif connection.connection is not None:
+            counts[connection.alias] = counts.get(connection.alias, 0) + 1
+    return {
+        ('yamdb_db_connections', (('alias', alias),)): count
+        for alias, count in counts.items()
+    }
+
+
+def add(totals, values):
+    for key, value in values.items():
+        if isinstance(value, list):
+            current = totals.setdefault(key, [0] * len(value))
+            for index, item in enumerate(value):
+                current[index] += item
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+def snapshot():
+    """Значения процесса: суммы по всем потокам и текущие показатели."""
+    counters, histograms = {}, {}
+    for store in list(_stores):
+        # Копии словарей снимаются целиком, пока потоки продолжают запись.
+        add(counters, dict(store.counters))
+        add(histograms, dict(store.histograms))
+    return {
+        'pid': os.getpid(),
+        'counters': counters,
+        'histograms': histograms,
+        'gauges': open_connections(),
+    }
+
+
+def dump(data):
+    return json.dumps({
+        'pid': data['pid'],
+        **{
+            kind: [[name, labels, value]
+                   for (name, labels), value in data[kind].items()]
+            for kind in ('counters', 'histograms', 'gauges')
+        },
+    })
+
+
+def load(text):
+    data = json.loads(text)
+    return {
+        'pid': data['pid'],
+        **{
+            kind: {
+                (name, tuple(map(tuple, labels))): value
+                for name, labels, value in data[kind]
+            }
+            for kind in ('counters', 'histograms', 'gauges')
+        },
+    }
+
+
+def flush(data=None):
+    """Записывает значения процесса в METRICS_DIR/<pid>.json."""
+    if not settings.METRICS_DIR:
+        return
+    data = data or snapshot()
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    # Файл заменяется целиком, поэтому читатели не видят его частично.
+    temporary = directory / f'{data["pid"]}.{threading.get_ident()}.tmp'
+    temporary.write_text(dump(data), encoding='utf-8')
+    os.replace(temporary, directory / f'{data["pid"]}.json')
+
+
+def maybe_flush():
+    global _next_flush
+    now = time.monotonic()
+    if not settings.METRICS_DIR or now < _next_flush:
+        return
+    _next_flush = now + settings.METRICS_FLUSH_INTERVAL
+    flush()
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect():
+    """Снимки всех процессов: свой и остальные из файлов METRICS_DIR."""
+    own = snapshot()
+    if not settings.METRICS_DIR:
+        return [own]
+    flush(own)
+    snapshots = [own]
+    for path in Path(settings.METRICS_DIR).glob('*.json'):
+        if path.stem == str(own['pid']):
+            continue
+        try:
+            data = load(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError, KeyError):
+            continue
+        if not alive(data['pid']):
+            data['gauges'] = {}
+        snapshots.append(data)
+    return snapshots
+
+
+def escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        f'{name}="{escape(value)}"' for name, value in labels
+    )
+
+
+def histogram_lines(name, labels, series):
+    buckets = METRICS[name][2]
+    cumulative = 0
+    for bound, count in zip((*map(float, buckets), '+Inf'), series):
+        cumulative += count
+        yield (
+            f'{name}_bucket{format_labels((*labels, ("le", bound)))} '
+            f'{cumulative}'
+        )
+    yield f'{name}_sum{format_labels(labels)} {series[-1]}'
+    yield f'{name}_count{format_labels(labels)} {cumulative}'
+
+
+def render(snapshots):
+    """Текстовый формат Prometheus для суммы снимков процессов."""
+    totals = {}
+    for data in snapshots:
+        for kind in ('counters', 'histograms', 'gauges'):
+            add(totals, data[kind])
+    lines = []
+    for name, (kind, description, _) in METRICS.items():
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        for (series_name, labels), value in sorted(totals.items()):
+            if series_name != name:
+                continue
+            if kind == 'histogram':
+                lines.extend(histogram_lines(name, labels, value))
+            else:
+                lines.append(f'{name}{format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+@require_safe
+def metrics_view(request):
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django отличает асинхронные middleware (см. MiddlewareMixin).
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        connection_created.connect(
+            connection_opened, dispatch_uid='api.metrics'
+        )
+        for connection in connections.all():
+            track_connection(connection)
+        atexit.unregister(flush)
+        atexit.register(flush)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.finish(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.finish(request, response, started)
+        return response
+
+    @staticmethod
+    def finish(request, response, started):
+        method = request.method if request.method in METHODS else 'other'
+        route = route_template(request)
+        observe(
+            'yamdb_http_request_duration_seconds',
+            (('method', method), ('route', route)),
+            time.perf_counter() - started,
+        )
+        inc('yamdb_http_requests_total', (
+            ('method', method), ('route', route),
+            ('status', str(response.status_code)),
+        ))
+        maybe_flush()
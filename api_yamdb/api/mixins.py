@@ -0,0 +1,15 @@
+from rest_framework import filters, mixins, viewsets
+
+from api.permissions import IsAdminOrReadOnly
+
+
+class CategoryGenreMixin(
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    permission_classes = (IsAdminOrReadOnly,)
+    filter_backends = (filters.SearchFilter,)
+    search_fields = ('name',)
+    lookup_field = 'slug'
@@ -0,0 +1,170 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_EXACT = 'exact'
+COUNT_APPROXIMATE = 'approximate'
+COUNT_NONE = 'none'
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу (pub_date, id).
+
+    Страница выбирается условием по ключу последнего показанного объекта,
+    поэтому стоимость запроса не растёт с номером страницы, в отличие от
+    OFFSET. Курсор хранит значение ключа и направление обхода.
+
+    Параметр count управляет полем count ответа:
+    none (по умолчанию) - не считать; exact - точный COUNT(*);
+    approximate - оценка от представления (get_approximate_count) или
+    подсчёт не более KEYSET_PAGINATION_COUNT_LIMIT строк.
+    """
+
+    ordering = ('pub_date', 'id')
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def __init__(self):
+        self.page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.count = self.get_count(queryset, request, view)
+        position, reverse = self.decode_cursor(request, queryset.model)
+        first, second = self.ordering
+        if reverse:
+            page = queryset.order_by(f'-{first}', f'-{second}')
+        else:
+            page = queryset.order_by(first, second)
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if reverse else 'gt'
+            page = page.filter(
+                Q(**{f'{first}__{lookup}': value})
+                | Q(**{first: value, f'{second}__{lookup}': pk})
+            )
+        results = list(page[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+        self.has_next = has_more if not reverse else position is not None
+        self.has_previous = position is not None if not reverse else has_more
+        self.results = results
+        self.position = position
+        return results
+
+    def get_count(self, queryset, request, view):
+        mode = request.query_params.get(self.count_query_param, COUNT_NONE)
+        if mode == COUNT_EXACT:
+            return queryset.count()
+        if mode == COUNT_APPROXIMATE:
+            if hasattr(view, 'get_approximate_count'):
+                return view.get_approximate_count(queryset)
+            limit = settings.KEYSET_PAGINATION_COUNT_LIMIT
+            return queryset.order_by()[:limit].count()
+        return None
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict((
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        )))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.results:
+            return self.encode_cursor(self.results[-1], reverse=False)
+        return self.encode_position(self.position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.results:
+            return self.encode_cursor(self.results[0], reverse=True)
+        return self.encode_position(self.position, reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        # Страница может состоять из строк values() (api/row_serializers.py).
+        first, second = self.ordering
+        if isinstance(instance, dict):
+            position = (instance[first], instance[second])
+        else:
+            position = (getattr(instance, first), getattr(instance, second))
+        return self.encode_position(position, reverse)
+
+    def encode_position(self, position, reverse):
+        value, pk = position
+        token = json.dumps((value.isoformat(), pk, reverse))
+        encoded = urlsafe_b64encode(token.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            value, pk, reverse = json.loads(urlsafe_b64decode(encoded))
+            value = model._meta.get_field(self.ordering[0]).to_python(value)
+            position = (value, int(pk))
+        except (Base64Error, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        # to_python(None) возвращает None, а сравнение с NULL невозможно.
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(reverse)
+
+
+class PageSizePagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы из параметра page_size.
+
+    Размер не больше MAX_PAGE_SIZE; без параметра - PAGE_SIZE.
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class ReviewCommentPagination(PageSizePagination):
+    """Постраничная пагинация с переключением на пагинацию по ключу.
+
+    Без параметра cursor ответ такой же, как у остальных эндпоинтов.
+    С параметром cursor (пустым для первой страницы) используется
+    KeysetPagination.
+    """
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if KeysetPagination.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.keyset = KeysetPagination()
+        self.keyset.page_size = self.get_page_size(request)
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    @property
+    def count(self):
+        if self.keyset:
+            return self.keyset.count
+        page = getattr(self, 'page', None)
+        return page and page.paginator.count
@@ -0,0 +1,36 @@
+from rest_framework import permissions
+
+
+class IsAdmin(permissions.BasePermission):
+    """Доступ только администраторам и суперпользователям."""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.is_admin
+
+
+class IsAdminOrReadOnly(permissions.BasePermission):
+    """Чтение доступно всем, изменение - только администраторам."""
+
+    def has_permission(self, request, view):
+        return (
+            request.method in permissions.SAFE_METHODS
+            or request.user.is_authenticated and request.user.is_admin
+        )
+
+
+class IsAuthorModeratorAdminOrReadOnly(permissions.BasePermission):
+    """Изменять объект могут автор, модератор и администратор."""
+
+    def has_permission(self, request, view):
+        return (
+            request.method in permissions.SAFE_METHODS
+            or request.user.is_authenticated
+        )
+
+    def has_object_permission(self, request, view, obj):
+        return (
+            request.method in permissions.SAFE_METHODS
+            or obj.author == request.user
+            or request.user.is_moderator
+            or request.user.is_admin
+        )
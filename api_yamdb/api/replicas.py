@@ -0,0 +1,128 @@
+"""Чтение из реплик базы данных.
+
+ReplicaRouter отправляет чтение безопасных запросов (GET, HEAD, OPTIONS) на
+случайную реплику из DATABASE_REPLICAS, а запись и чтение остальных
+запросов, команд управления и фоновых задач - в основную базу default.
+Какой запрос сейчас обрабатывается, router узнаёт из переменной контекста,
+которую устанавливает ReplicaMiddleware.
+
+Реплика отстаёт от основной базы, поэтому после запроса на запись клиент
+DATABASE_REPLICA_PIN_SECONDS секунд читает из основной базы: автор сразу
+видит свой отзыв. Клиент определяется по заголовку Authorization, а без
+него - по IP-адресу; отметки хранятся в кеше default, поэтому для
+нескольких процессов нужен общий кеш (redis).
+
+Общие кеши (каталог, пользователи аутентификации) заполняются чтением из
+основной базы (primary()): иначе после сброса кеша в него снова попали бы
+отставшие данные реплики, причём на всё время жизни записи и для всех
+клиентов.
+"""
+import asyncio
+import hashlib
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+@contextmanager
+def primary():
+    """Чтение внутри блока идёт из основной базы."""
+    token = read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        read_from_replica.reset(token)
+
+
+def pin_key(request):
+    ident = (
+        request.META.get('HTTP_AUTHORIZATION')
+        or BaseThrottle().get_ident(request)
+    )
+    return f'replica-pin:{hashlib.md5(ident.encode()).hexdigest()}'
+
+
+def pinned(request):
+    """Писал ли клиент в базу последние DATABASE_REPLICA_PIN_SECONDS с."""
+    return (cache.get(pin_key(request)) or 0) > time.time()
+
+
+def pin(request):
+    seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+    cache.set(pin_key(request), time.time() + seconds, math.ceil(seconds))
+
+
+# Обращения к кешу из цикла событий выполняются в пуле потоков.
+pinned_async = sync_to_async(pinned, thread_sensitive=False)
+pin_async = sync_to_async(pin, thread_sensitive=False)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Объект, прочитанный из реплики, всё равно сохраняется в основную
+        # базу.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # В репликах те же данные, что и в основной базе.
+        return True
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django отличает асинхронные middleware (см. MiddlewareMixin).
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    @staticmethod
+    def use_replica(request):
+        return request.method in SAFE_METHODS and not pinned(request)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = read_from_replica.set(self.use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+        if request.method not in SAFE_METHODS:
+            pin(request)
+        return response
+
+    async def __acall__(self, request):
+        token = read_from_replica.set(
+            request.method in SAFE_METHODS and not await pinned_async(request)
+        )
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_from_replica.reset(token)
+        if request.method not in SAFE_METHODS:
+            await pin_async(request)
+        return response
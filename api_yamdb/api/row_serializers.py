@@ -0,0 +1,131 @@
+"""Сериализация списков из строк values() без объектов моделей.
+
+На страницах списков основное время уходит на создание объектов моделей
+(у автора отзыва больше десятка полей) и на обход полей сериализатора DRF
+для каждого объекта. RowSerializer один раз разбирает поля обычного
+сериализатора: для каждого поля запоминает столбец values() и метод
+to_representation. Страница выбирается одним values() только с нужными
+столбцами, связи многие-ко-многим - одним запросом к таблице связи, а
+словари ответа собираются прямо из строк. JSON ответа совпадает с ответом
+обычного сериализатора байт в байт.
+
+Поддерживаются поля модели, SlugRelatedField и PrimaryKeyRelatedField,
+вложенные сериализаторы по внешнему ключу и вложенные списки по связи
+многие-ко-многим.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+
+def related_lookup(prefix, ordering):
+    if ordering.startswith('-'):
+        return f'-{prefix}{ordering[1:]}'
+    return f'{prefix}{ordering}'
+
+
+class RowSerializer:
+    """Строит представления строк так же, как serializer_class объектов."""
+
+    def __init__(self, serializer_class, prefix=''):
+        serializer = serializer_class()
+        self.model = serializer.Meta.model
+        self.lookups = [] if prefix else ['pk']
+        # (имя в ответе, столбец строки, преобразование, вложенный
+        # RowSerializer); у списков многие-ко-многим столбец - pk.
+        self.fields = []
+        self.many = {}
+        for name, field in serializer.fields.items():
+            self.add_field(name, field, prefix)
+
+    def add_field(self, name, field, prefix):
+        source = field.source.replace('.', '__')
+        if isinstance(field, serializers.ListSerializer):
+            self.many[name] = (source, RowSerializer(
+                type(field.child),
+                prefix=self.model._meta.get_field(source)
+                .m2m_reverse_field_name() + '__',
+            ))
+            self.fields.append((name, 'pk', None, self.many[name][1]))
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = RowSerializer(type(field), prefix=f'{prefix}{source}__')
+            if nested.many:
+                raise ImproperlyConfigured(
+                    f'Поле {name}: списки во вложенных сериализаторах не '
+                    'поддерживаются.'
+                )
+            self.lookups += [f'{prefix}{source}', *nested.lookups]
+            self.fields.append((name, f'{prefix}{source}', None, nested))
+        elif isinstance(field, serializers.SlugRelatedField):
+            self.add_column(name, f'{prefix}{source}__{field.slug_field}')
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            self.add_column(name, f'{prefix}{source}')
+        elif isinstance(field, serializers.RelatedField) or source == '*':
+            raise ImproperlyConfigured(
+                f'Поле {name} нельзя построить из строки values().'
+            )
+        else:
+            self.add_column(name, f'{prefix}{source}', field.to_representation)
+
+    def add_column(self, name, lookup, convert=None):
+        self.lookups.append(lookup)
+        self.fields.append((name, lookup, convert, None))
+
+    def rows(self, queryset):
+        """Строки для serialize() из queryset объектов модели."""
+        return queryset.prefetch_related(None).values(*self.lookups)
+
+    def related(self, source, nested, pks):
+        """Представления связанных объектов по первичному ключу строки.
+
+        Порядок - как у менеджера связанной модели, то есть как при
+        prefetch_related.
+        """
+        field = self.model._meta.get_field(source)
+        source_name = field.m2m_field_name()
+        prefix = f'{field.m2m_reverse_field_name()}__'
+        rows = (
+            field.remote_field.through._default_manager
+            .filter(**{f'{source_name}__in': pks})
+            .order_by(*(
+                related_lookup(prefix, ordering)
+                for ordering in nested.model._meta.ordering
+            ))
+            .values(source_name, *nested.lookups)
+        )
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row[source_name], []).append(
+                nested.represent(row, {})
+            )
+        return grouped
+
+    def represent(self, row, related):
+        data = {}
+        for name, key, convert, nested in self.fields:
+            value = row[key]
+            if nested is not None and name in related:
+                data[name] = related[name].get(value, [])
+            elif value is None:
+                data[name] = None
+            elif nested is not None:
+                data[name] = nested.represent(row, {})
+            elif convert is None:
+                data[name] = value
+            else:
+                data[name] = convert(value)
+        return data
+
+    def serialize(self, rows):
+        pks = [row['pk'] for row in rows]
+        related = {
+            name: self.related(source, nested, pks)
+            for name, (source, nested) in self.many.items()
+        }
+        return [self.represent(row, related) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def row_serializer(serializer_class):
+    return RowSerializer(serializer_class)
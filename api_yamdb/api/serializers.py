@@ -0,0 +1,155 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from rest_framework import serializers
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from search.models import SearchDocument
+from users.models import EMAIL_MAX_LENGTH, USERNAME_MAX_LENGTH
+from users.validators import validate_username
+
+User = get_user_model()
+
+# Наибольший первичный ключ (bigint): большие числа в запросе не доходят
+# до базы.
+MAX_ID = 2 ** 63 - 1
+
+
+class UserSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = User
+        fields = (
+            'username', 'email', 'first_name', 'last_name', 'bio', 'role'
+        )
+
+
+class MeSerializer(UserSerializer):
+
+    class Meta(UserSerializer.Meta):
+        read_only_fields = ('role',)
+
+
+class SignUpSerializer(serializers.Serializer):
+    username = serializers.CharField(
+        max_length=USERNAME_MAX_LENGTH,
+        validators=(UnicodeUsernameValidator(), validate_username),
+    )
+    email = serializers.EmailField(max_length=EMAIL_MAX_LENGTH)
+
+    def validate(self, data):
+        user = User.objects.filter(username=data['username']).first()
+        if user and user.email != data['email']:
+            raise serializers.ValidationError(
+                {'email': 'Пользователь с таким username уже существует.'}
+            )
+        if not user and User.objects.filter(email=data['email']).exists():
+            raise serializers.ValidationError(
+                {'username': 'Пользователь с таким email уже существует.'}
+            )
+        return data
+
+
+class TokenSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=USERNAME_MAX_LENGTH)
+    confirmation_code = serializers.CharField()
+
+
+class CategorySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Category
+        fields = ('name', 'slug')
+
+
+class GenreSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Genre
+        fields = ('name', 'slug')
+
+
+class TitleReadSerializer(serializers.ModelSerializer):
+    genre = GenreSerializer(many=True, read_only=True)
+    category = CategorySerializer(read_only=True)
+
+    class Meta:
+        model = Title
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre', 'category'
+        )
+        read_only_fields = fields
+
+
+class TitleWriteSerializer(serializers.ModelSerializer):
+    genre = serializers.SlugRelatedField(
+        slug_field='slug',
+        queryset=Genre.objects.all(),
+        many=True,
+        allow_empty=False,
+    )
+    category = serializers.SlugRelatedField(
+        slug_field='slug', queryset=Category.objects.all()
+    )
+
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+
+    def to_representation(self, instance):
+        return TitleReadSerializer(instance, context=self.context).data
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+
+    class Meta:
+        model = Review
+        fields = ('id', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentSerializer(serializers.ModelSerializer):
+    author = serializers.SlugRelatedField(
+        slug_field='username', read_only=True
+    )
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'text', 'author', 'pub_date')
+
+
+class ReviewBatchSerializer(ReviewSerializer):
+    """Отзыв в пакете /reviews/batch/: произведение указывается в теле."""
+
+    title = serializers.IntegerField(
+        source='title_id', min_value=1, max_value=MAX_ID
+    )
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class CommentBatchSerializer(CommentSerializer):
+    """Комментарий в пакете /comments/batch/."""
+
+    title = serializers.IntegerField(
+        write_only=True, min_value=1, max_value=MAX_ID
+    )
+    review = serializers.IntegerField(
+        source='review_id', min_value=1, max_value=MAX_ID
+    )
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('title', 'review')
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    title_id = serializers.IntegerField()
+    rank = serializers.FloatField()
+
+    class Meta:
+        model = SearchDocument
+        fields = ('type', 'id', 'title_id', 'text', 'rank')
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import forget_user
+from api.cache import CATEGORIES, GENRES, TITLES, invalidate
+from reviews.models import Category, Genre, Title
+from reviews.signals import title_stats_changed
+
+User = get_user_model()
+
+# Категории и жанры вложены в ответы произведений, поэтому их изменение
+# сбрасывает и кеш произведений.
+INVALIDATED_GROUPS = {
+    Category: (CATEGORIES, TITLES),
+    Genre: (GENRES, TITLES),
+    Title: (TITLES,),
+}
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Title)
+def invalidate_catalogue(sender, **kwargs):
+    invalidate(*INVALIDATED_GROUPS[sender])
+
+
+@receiver(title_stats_changed, sender=Title)
+def invalidate_title_stats(sender, **kwargs):
+    invalidate(TITLES)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate(TITLES)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
@@ -0,0 +1,170 @@
+"""Ограничение частоты запросов к регистрации, токенам и записи отзывов.
+
+Счётчики хранятся в общем кеше (CACHES['default']), поэтому ограничения
+действуют на все процессы сервера. Используется скользящее окно из двух
+счётчиков: число запросов в текущем окне складывается с числом запросов в
+предыдущем, умноженным на долю предыдущего окна, ещё попадающую в
+скользящее. Счётчик увеличивается атомарно (cache.incr), а при отказе
+уменьшается обратно, так что отклонённые запросы не расходуют лимит.
+Пакетные запросы ограничиваются отдельными лимитами write_batch_*, которые
+считаются в элементах пакета. Пакет больше лимита не пройдёт ни в каком
+окне, поэтому он отклоняется с ответом 400, а не 429.
+
+Лимиты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] по ключу scope;
+если лимита нет или THROTTLING_ENABLED выключен, запрос пропускается.
+"""
+import hashlib
+import math
+import time
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """Разбирает лимит вида '20/hour' в (число запросов, окно в секундах)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def scope_limit(scope):
+    """Лимит scope в запросах или None, если он не действует."""
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if not settings.THROTTLING_ENABLED or not rate:
+        return None
+    return parse_rate(rate)[0]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    scope = None
+    throttled_methods = ('POST',)
+
+    def get_ident_key(self, request, view):
+        """Возвращает то, что ограничивается, или None, чтобы не проверять."""
+        raise NotImplementedError
+
+    def get_cost(self, request, view):
+        """Сколько запросов из лимита расходует запрос."""
+        return 1
+
+    def allow_request(self, request, view):
+        if (
+            not settings.THROTTLING_ENABLED
+            or request.method not in self.throttled_methods
+        ):
+            return True
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        ident = self.get_ident_key(request, view)
+        if not rate or ident is None:
+            return True
+        cost = self.get_cost(request, view)
+        limit, window = parse_rate(rate)
+        if cost > limit:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Запрос превышает лимит {rate}: передайте не больше '
+                f'{limit} элементов.'
+            ]})
+        ident = hashlib.md5(str(ident).encode()).hexdigest()
+        index, elapsed = divmod(time.time(), window)
+        key = f'throttle:{self.scope}:{ident}:{int(index)}'
+        previous = cache.get(f'throttle:{self.scope}:{ident}:{int(index) - 1}')
+        previous = previous or 0
+        cache.add(key, 0, window * 2)
+        try:
+            current = cache.incr(key, cost)
+        except ValueError:
+            cache.add(key, cost, window * 2)
+            current = cost
+        weight = 1 - elapsed / window
+        if previous * weight + current <= limit:
+            return True
+        try:
+            cache.decr(key, cost)
+        except ValueError:
+            pass
+        self.retry_after = self.get_retry_after(
+            limit, window, elapsed, previous, current - cost, cost
+        )
+        return False
+
+    @staticmethod
+    def get_retry_after(limit, window, elapsed, previous, current, cost=1):
+        if current + cost > limit:
+            # Лимит исчерпан в текущем окне: ждать его конца.
+            return window - elapsed
+        # Ждать, пока вклад предыдущего окна не уменьшится достаточно.
+        share = 1 - (limit - current - cost) / previous
+        return share * window - elapsed
+
+    def wait(self):
+        return max(1, math.ceil(self.retry_after))
+
+
+class IPThrottle(SlidingWindowThrottle):
+
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(SlidingWindowThrottle):
+
+    def get_ident_key(self, request, view):
+        # Тело может быть списком или числом: его отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        username = request.data.get('username')
+        return str(username).lower() if username else None
+
+
+class UserThrottle(SlidingWindowThrottle):
+
+    def get_ident_key(self, request, view):
+        return request.user.pk if request.user.is_authenticated else None
+
+
+class SignUpIPThrottle(IPThrottle):
+    scope = 'signup_ip'
+
+
+class SignUpUsernameThrottle(UsernameThrottle):
+    scope = 'signup_username'
+
+
+class TokenIPThrottle(IPThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameThrottle(UsernameThrottle):
+    scope = 'token_username'
+
+
+class WriteIPThrottle(IPThrottle):
+    scope = 'write_ip'
+
+
+class WriteUserThrottle(UserThrottle):
+    scope = 'write_user'
+
+
+class BatchCostMixin:
+    """Пакет /reviews/batch/ или /comments/batch/ расходует лимит по
+    числу элементов."""
+
+    def get_cost(self, request, view):
+        if isinstance(request.data, list) and request.data:
+            return len(request.data)
+        return 1
+
+
+class WriteBatchIPThrottle(BatchCostMixin, IPThrottle):
+    scope = 'write_batch_ip'
+
+
+class WriteBatchUserThrottle(BatchCostMixin, UserThrottle):
+    scope = 'write_batch_user'
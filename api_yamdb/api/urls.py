@@ -0,0 +1,40 @@
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from api.views import (
+    CategoryViewSet, CommentViewSet, GenreViewSet, ReviewViewSet,
+    SearchViewSet, TitleViewSet, UserViewSet, comment_batch, export,
+    review_batch, signup, token
+)
+
+router_v1 = DefaultRouter()
+router_v1.register('users', UserViewSet, basename='users')
+router_v1.register('categories', CategoryViewSet, basename='categories')
+router_v1.register('genres', GenreViewSet, basename='genres')
+router_v1.register('titles', TitleViewSet, basename='titles')
+router_v1.register('search', SearchViewSet, basename='search')
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews',
+    ReviewViewSet,
+    basename='reviews'
+)
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
+    CommentViewSet,
+    basename='comments'
+)
+
+auth_urls = [
+    path('signup/', signup, name='signup'),
+    path('token/', token, name='token'),
+]
+
+urlpatterns = [
+    path('v1/auth/', include(auth_urls)),
+    path(
+        'v1/export/<slug:name>.<slug:file_format>', export, name='export'
+    ),
+    path('v1/reviews/batch/', review_batch, name='review-batch'),
+    path('v1/comments/batch/', comment_batch, name='comment-batch'),
+    path('v1/', include(router_v1.urls)),
+]
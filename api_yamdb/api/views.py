@@ -0,0 +1,340 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import filters, mixins, renderers, status, viewsets
+from rest_framework.decorators import (
+    action, api_view, permission_classes, throttle_classes
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api.async_views import AsyncReadMixin
+from api.authentication import UserAccessToken
+from api.batch import check_items, create_comments, create_reviews
+from api.cache import CATEGORIES, GENRES, TITLES, CachedListMixin
+from api.conditional import (
+    ConditionalGetMixin, ConditionalRetrieveMixin, etag_matches,
+    not_modified, set_validators
+)
+from api.exports import (
+    CHUNKS, CONTENT_TYPES, EXPORTS, export_rows, next_updated_since,
+    parse_updated_since
+)
+from api.filters import TitleFilter
+from api.mixins import CategoryGenreMixin
+from api.pagination import PageSizePagination, ReviewCommentPagination
+from api.permissions import (
+    IsAdmin, IsAdminOrReadOnly, IsAuthorModeratorAdminOrReadOnly
+)
+from api.serializers import (
+    CategorySerializer, CommentSerializer, GenreSerializer, MeSerializer,
+    ReviewSerializer, SearchResultSerializer, SignUpSerializer,
+    TitleReadSerializer, TitleWriteSerializer, TokenSerializer, UserSerializer
+)
+from api.throttling import (
+    SignUpIPThrottle, SignUpUsernameThrottle, TokenIPThrottle,
+    TokenUsernameThrottle, WriteBatchIPThrottle, WriteBatchUserThrottle,
+    WriteIPThrottle, WriteUserThrottle
+)
+from outbox.mail import enqueue
+from reviews.dataset import isoformat
+from reviews.models import Category, Genre, Review, Title
+from search.backends import search_documents
+from search.models import KIND_CHOICES
+from users.tokens import confirmation_code_generator
+
+User = get_user_model()
+
+
+def send_confirmation_code(user):
+    # Код не хранится: /auth/token/ проверяет его подпись.
+    enqueue(
+        subject='Код подтверждения YaMDb',
+        body=(
+            'Ваш код подтверждения: '
+            f'{confirmation_code_generator.make_token(user)}'
+        ),
+        recipient=user.email,
+    )
+
+
+@api_view(('POST',))
+@permission_classes((AllowAny,))
+@throttle_classes((SignUpIPThrottle, SignUpUsernameThrottle))
+def signup(request):
+    serializer = SignUpSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    user, _ = User.objects.get_or_create(**serializer.validated_data)
+    send_confirmation_code(user)
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(('POST',))
+@permission_classes((AllowAny,))
+@throttle_classes((TokenIPThrottle, TokenUsernameThrottle))
+def token(request):
+    serializer = TokenSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    user = get_object_or_404(
+        User, username=serializer.validated_data['username']
+    )
+    if not confirmation_code_generator.check_token(
+        user, serializer.validated_data['confirmation_code']
+    ):
+        return Response(
+            {'confirmation_code': ['Неверный код подтверждения.']},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    # Новое время входа делает выданные коды недействительными.
+    update_last_login(None, user)
+    return Response(
+        {'token': str(UserAccessToken.for_user(user))},
+        status=status.HTTP_200_OK,
+    )
+
+
+@api_view(('GET',))
+@permission_classes((IsAdmin,))
+def export(request, name, file_format):
+    """Потоковая выгрузка /export/<titles|reviews|comments>.<csv|ndjson>.
+
+    С параметром updated_since выгружаются только строки, изменённые не
+    раньше этого момента. Заголовок X-Next-Updated-Since - значение
+    updated_since для следующей выгрузки (api/exports.py).
+    """
+    if name not in EXPORTS or file_format not in CHUNKS:
+        raise Http404
+    if isinstance(request._request, ASGIRequest):
+        # Django 3.2 читает потоковый ответ в цикле событий, где запросы к
+        # базе запрещены: клиент получил бы оборванный файл со статусом 200.
+        return Response(
+            {'detail': 'Выгрузка доступна только через WSGI-сервер.'},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    updated_since = request.query_params.get('updated_since')
+    if updated_since is not None:
+        try:
+            updated_since = parse_updated_since(updated_since)
+        except ValueError as error:
+            raise ValidationError({'updated_since': str(error)})
+    watermark = next_updated_since()
+    response = StreamingHttpResponse(
+        CHUNKS[file_format](name, export_rows(name, updated_since)),
+        content_type=CONTENT_TYPES[file_format],
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{file_format}"'
+    )
+    response['X-Next-Updated-Since'] = isoformat(watermark)
+    return response
+
+
+@api_view(('POST',))
+@permission_classes((IsAuthenticated,))
+@throttle_classes((WriteBatchIPThrottle, WriteBatchUserThrottle))
+def review_batch(request):
+    """Создаёт до BATCH_WRITE_MAX_ITEMS отзывов одним запросом."""
+    check_items(request.data)
+    return Response(create_reviews(request.data, request.user))
+
+
+@api_view(('POST',))
+@permission_classes((IsAuthenticated,))
+@throttle_classes((WriteBatchIPThrottle, WriteBatchUserThrottle))
+def comment_batch(request):
+    """Создаёт до BATCH_WRITE_MAX_ITEMS комментариев одним запросом."""
+    check_items(request.data)
+    return Response(create_comments(request.data, request.user))
+
+
+class UserViewSet(ConditionalRetrieveMixin, viewsets.ModelViewSet):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    permission_classes = (IsAdmin,)
+    pagination_class = PageSizePagination
+    filter_backends = (filters.SearchFilter,)
+    search_fields = ('username',)
+    lookup_field = 'username'
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    def perform_update(self, serializer):
+        user = serializer.instance
+        if serializer.validated_data.get('role', user.role) != user.role:
+            # Токены со старой ролью больше не принимаются.
+            serializer.save(token_version=user.token_version + 1)
+            return
+        serializer.save()
+
+    @action(
+        detail=False,
+        methods=('get', 'patch'),
+        permission_classes=(IsAuthenticated,),
+        serializer_class=MeSerializer,
+    )
+    def me(self, request):
+        # request.user может быть взят из кеша аутентификации, а здесь
+        # нужны актуальные данные.
+        user = get_object_or_404(User, pk=request.user.pk)
+        if request.method == 'GET':
+            etag, last_modified = self.get_validators((user,))
+            if etag_matches(request, etag):
+                return not_modified(etag, last_modified)
+            return set_validators(
+                Response(self.get_serializer(user).data),
+                etag,
+                last_modified,
+            )
+        serializer = self.get_serializer(user, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+
+class CategoryViewSet(
+    AsyncReadMixin, CachedListMixin, ConditionalGetMixin, CategoryGenreMixin
+):
+    queryset = Category.objects.all()
+    serializer_class = CategorySerializer
+    cache_group = CATEGORIES
+
+
+class GenreViewSet(
+    AsyncReadMixin, CachedListMixin, ConditionalGetMixin, CategoryGenreMixin
+):
+    queryset = Genre.objects.all()
+    serializer_class = GenreSerializer
+    cache_group = GENRES
+
+
+class TitleViewSet(
+    AsyncReadMixin, CachedListMixin, ConditionalRetrieveMixin,
+    viewsets.ModelViewSet
+):
+    # Рейтинг хранится в самом произведении, а категория и жанры страницы
+    # загружаются двумя запросами независимо от её размера.
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
+    cache_group = TITLES
+    row_serializer_class = TitleReadSerializer
+    etag_fields = (
+        'pk', 'updated_at', 'category__updated_at', 'genre__updated_at'
+    )
+    permission_classes = (IsAdminOrReadOnly,)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = TitleFilter
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    def get_serializer_class(self):
+        if self.request.method in ('POST', 'PATCH'):
+            return TitleWriteSerializer
+        return TitleReadSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+
+class ReviewViewSet(
+    AsyncReadMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
+    serializer_class = ReviewSerializer
+    row_serializer_class = ReviewSerializer
+    etag_fields = ('pk', 'updated_at', 'author__username')
+    permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    pagination_class = ReviewCommentPagination
+    throttle_classes = (WriteIPThrottle, WriteUserThrottle)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    def get_title(self):
+        return get_object_or_404(Title, pk=self.kwargs['title_id'])
+
+    def get_queryset(self):
+        return self.get_title().reviews.select_related('author')
+
+    def get_approximate_count(self, queryset):
+        # Число отзывов хранится в произведении, считать строки не нужно.
+        return self.get_title().reviews_count
+
+    def perform_create(self, serializer):
+        # Статистика произведения сдвигается до вставки: UPDATE заодно
+        # проверяет, что произведение есть, а второй отзыв автора
+        # отклоняет уникальное ограничение вместо отдельного SELECT.
+        title_id = self.kwargs['title_id']
+        try:
+            with transaction.atomic():
+                if not Title.apply_review_change(
+                    title_id, serializer.validated_data['score'], 1
+                ):
+                    raise Http404
+                serializer.save(author=self.request.user, title_id=title_id)
+        except IntegrityError:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставили отзыв на это произведение.'
+            ]})
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        review = serializer.save()
+        # Правка только текста не меняет произведение, его updated_at и ETag.
+        if review.score != old_score:
+            Title.apply_review_change(
+                review.title_id, review.score - old_score
+            )
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # Статистику произведения пересчитывает по оставшимся отзывам
+        # post_delete (reviews/signals.py).
+        instance.delete()
+
+
+class CommentViewSet(
+    AsyncReadMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet
+):
+    serializer_class = CommentSerializer
+    row_serializer_class = CommentSerializer
+    etag_fields = ('pk', 'updated_at', 'author__username')
+    permission_classes = (IsAuthorModeratorAdminOrReadOnly,)
+    pagination_class = ReviewCommentPagination
+    throttle_classes = (WriteIPThrottle, WriteUserThrottle)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+
+    def get_review(self):
+        return get_object_or_404(
+            Review,
+            pk=self.kwargs['review_id'],
+            title_id=self.kwargs['title_id'],
+        )
+
+    def get_queryset(self):
+        return self.get_review().comments.select_related('author')
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, review=self.get_review())
+
+
+class SearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Полнотекстовый поиск: ?q=<запрос>&type=title&type=review."""
+
+    serializer_class = SearchResultSerializer
+    # rank - число с плавающей точкой, а orjson записывает его иначе, чем
+    # json (0.00001 вместо 1e-05).
+    renderer_classes = (
+        renderers.JSONRenderer, renderers.BrowsableAPIRenderer
+    )
+
+    def get_queryset(self):
+        kinds = self.request.query_params.getlist('type')
+        unknown = set(kinds) - {kind for kind, _ in KIND_CHOICES}
+        if unknown:
+            raise ValidationError(
+                {'type': f'Неизвестный тип: {", ".join(sorted(unknown))}.'}
+            )
+        return search_documents(self.request.query_params.get('q', ''), kinds)
@@ -2,6 +2,13 @@
 ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with any ASGI server, for example::
+
+    uvicorn api_yamdb.asgi:application --workers 4
+    daphne api_yamdb.asgi:application
+
+List endpoints of the catalogue, reviews and comments are served by async
+views here (see ``api/async_views.py``); ``ASYNC_VIEWS=0`` turns them off.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
@@ -12,5 +19,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,15 @@
+"""SQLite с журналом WAL.
+
+В режиме WAL читатели не блокируют писателя и наоборот, а ожидание
+блокировки записи ограничивается параметром `timeout` из OPTIONS.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
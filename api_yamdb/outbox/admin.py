@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from outbox.models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'status', 'attempts', 'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = ('status',)
+    search_fields = ('recipient',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
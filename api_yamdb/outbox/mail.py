@@ -0,0 +1,124 @@
+"""Очередь исходящих писем в базе данных.
+
+enqueue() сохраняет письмо в той же транзакции, что и изменения, ради
+которых оно отправляется, поэтому запрос не ждёт почтовый сервер, а письмо
+не теряется при его недоступности. Письма отправляет команда send_outbox:
+она забирает пачку готовых к отправке писем, продлевая им время следующей
+попытки (чтобы параллельные обработчики не взяли их же), отправляет пачку
+через одно соединение и откладывает неудачные письма с экспоненциально
+растущей задержкой. С EMAIL_OUTBOX_EAGER письмо отправляется сразу после
+фиксации транзакции тем же кодом; так удобно в тестах и при разработке.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from outbox.models import OutboxMessage
+
+
+def enqueue(subject, body, recipient, from_email=None):
+    message = OutboxMessage.objects.create(
+        subject=subject,
+        body=body,
+        recipient=recipient,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(lambda: deliver([message]))
+    return message
+
+
+def retry_delay(attempts):
+    return min(
+        settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1),
+        settings.EMAIL_OUTBOX_MAX_RETRY_DELAY,
+    )
+
+
+def claim_batch(batch_size):
+    """Забирает готовые к отправке письма и откладывает их на время отправки.
+
+    Если обработчик упадёт, не отметив письма, они снова станут доступны
+    после EMAIL_OUTBOX_LEASE секунд.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).update(
+            next_attempt_at=now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE
+            )
+        )
+    return messages
+
+
+def deliver(messages):
+    """Отправляет письма через одно соединение и возвращает число успешных."""
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for message in messages:
+            mark_failed(message, error)
+        return 0
+    sent = 0
+    try:
+        for message in messages:
+            try:
+                EmailMessage(
+                    subject=message.subject,
+                    body=message.body,
+                    from_email=message.from_email,
+                    to=(message.recipient,),
+                    connection=connection,
+                ).send()
+            except Exception as error:
+                mark_failed(message, error)
+            else:
+                mark_sent(message)
+                sent += 1
+    finally:
+        connection.close()
+    return sent
+
+
+def mark_sent(message):
+    message.status = OutboxMessage.SENT
+    message.attempts += 1
+    message.sent_at = timezone.now()
+    message.last_error = ''
+    message.save(update_fields=('status', 'attempts', 'sent_at', 'last_error'))
+
+
+def mark_failed(message, error):
+    message.attempts += 1
+    message.last_error = f'{type(error).__name__}: {error}'
+    if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxMessage.FAILED
+    else:
+        message.next_attempt_at = timezone.now() + timedelta(
+            seconds=retry_delay(message.attempts)
+        )
+    message.save(update_fields=(
+        'status', 'attempts', 'next_attempt_at', 'last_error'
+    ))
+
+
+def send_pending(batch_size):
+    """Отправляет все готовые письма пачками и возвращает (всего, успешно)."""
+    total = sent = 0
+    while True:
+        messages = claim_batch(batch_size)
+        if not messages:
+            return total, sent
+        total += len(messages)
+        sent += deliver(messages)
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from outbox.mail import send_pending
+
+BATCH_SIZE = 100
+INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди исходящей почты. Неудачные письма '
+        'откладываются с растущей задержкой и после EMAIL_OUTBOX_MAX_ATTEMPTS '
+        'попыток помечаются как неотправленные. С --loop команда работает '
+        'постоянно и проверяет очередь каждые --interval секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых писем.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=INTERVAL,
+            help='Пауза между проверками очереди в режиме --loop, с.'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Размер пачки должен быть положительным.')
+        while True:
+            total, sent = send_pending(options['batch_size'])
+            if total:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Отправлено писем: {sent} из {total}.'
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+SUBJECT_MAX_LENGTH = 255
+EMAIL_MAX_LENGTH = 254
+
+
+class OutboxMessage(models.Model):
+    """Письмо, ожидающее отправки командой send_outbox."""
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.CharField('Тема', max_length=SUBJECT_MAX_LENGTH)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=EMAIL_MAX_LENGTH)
+    recipient = models.EmailField('Получатель', max_length=EMAIL_MAX_LENGTH)
+    status = models.CharField(
+        'Статус',
+        max_length=max(len(status) for status, _ in STATUS_CHOICES),
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Исходящие письма'
+        # Отправленные письма копятся, а выбирать нужно только ожидающие.
+        indexes = (
+            models.Index(
+                fields=('next_attempt_at', 'id'),
+                condition=models.Q(status='pending'),
+                name='outbox_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
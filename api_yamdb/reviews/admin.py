@@ -0,0 +1,38 @@
+from django.contrib import admin
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+
+
+@admin.register(Category, Genre)
+class CategoryGenreAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name',)
+    prepopulated_fields = {'slug': ('name',)}
+
+
+@admin.register(Title)
+class TitleAdmin(admin.ModelAdmin):
+    list_display = ('name', 'year', 'category', 'rating', 'reviews_count')
+    list_filter = ('category', 'genre', 'year')
+    search_fields = ('name',)
+    readonly_fields = ('rating', 'reviews_count', 'score_sum')
+    inlines = (GenreTitleInline,)
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ('title', 'author', 'score', 'pub_date')
+    list_filter = ('pub_date',)
+    search_fields = ('text',)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('review', 'author', 'pub_date')
+    list_filter = ('pub_date',)
+    search_fields = ('text',)
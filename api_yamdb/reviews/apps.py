@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ReviewsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'reviews'
+    verbose_name = 'Отзывы'
+
+    def ready(self):
+        import reviews.signals  # noqa: F401
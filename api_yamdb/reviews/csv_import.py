@@ -0,0 +1,155 @@
+import csv
+import io
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+
+User = get_user_model()
+
+READ_BLOCK_SIZE = 1024 * 1024
+MAX_REPORTED_ERRORS = 10
+
+# Файлы перечислены в порядке зависимостей: каждая таблица загружается
+# после тех, на которые ссылаются её внешние ключи. Второй элемент кортежа
+# переименовывает столбцы CSV в атрибуты модели.
+CSV_FILES = (
+    ('users.csv', User, {}),
+    ('category.csv', Category, {}),
+    ('genre.csv', Genre, {}),
+    ('titles.csv', Title, {'category': 'category_id'}),
+    ('genre_title.csv', GenreTitle, {}),
+    ('review.csv', Review, {'author': 'author_id'}),
+    ('comments.csv', Comment, {'author': 'author_id'}),
+)
+CSV_MODELS = {filename: (model, columns) for filename, model, columns
+              in CSV_FILES}
+
+
+def read_batches(reader, batch_size):
+    """Отдаёт строки CSV пачками по batch_size."""
+    while True:
+        batch = list(islice(reader, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def build_object(model, row, columns):
+    fields = {
+        columns.get(column, column): value for column, value in row.items()
+    }
+    if model is User:
+        fields['password'] = make_password(None)
+    return model(**fields)
+
+
+def plan_chunks(path, chunk_size):
+    """Делит CSV-файл на байтовые диапазоны по границам записей.
+
+    Текст отзывов содержит переводы строк, поэтому граница ставится только
+    на перевод строки вне кавычек: перед ним в файле чётное число символов
+    `"` (экранированная кавычка `""` чётность не меняет). Возвращает
+    заголовок файла и список пар (начало, конец).
+    """
+    with open(path, 'rb') as csv_file:
+        header = next(csv.reader([csv_file.readline().decode('utf-8-sig')]))
+        chunk_start = position = csv_file.tell()
+        target = chunk_start + chunk_size
+        in_quotes = False
+        chunks = []
+        while True:
+            block = csv_file.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            index = 0
+            while position + len(block) > target:
+                newline = block.find(b'\n', max(index, target - position))
+                if newline == -1:
+                    break
+                in_quotes ^= block.count(b'"', index, newline) % 2 == 1
+                index = newline + 1
+                if in_quotes:
+                    target = position + index
+                    continue
+                chunks.append((chunk_start, position + index))
+                chunk_start = position + index
+                target = chunk_start + chunk_size
+            in_quotes ^= block.count(b'"', index) % 2 == 1
+            position += len(block)
+        if position > chunk_start:
+            chunks.append((chunk_start, position))
+    return header, chunks
+
+
+def import_chunk(filename, path, start, end, header, batch_size, dry_run,
+                 retry=False):
+    """Загружает один диапазон файла в отдельной транзакции.
+
+    Функция выполняется в процессах пула, поэтому принимает только
+    сериализуемые аргументы. При повторной загрузке (retry) после сбоя
+    диапазон мог быть уже зафиксирован, поэтому строки вставляются с
+    ignore_conflicts, а пропущенные считаются по первичным ключам пачки
+    до и после вставки. Иначе конфликт вызывает IntegrityError.
+    В режиме dry_run строки только проверяются валидаторами полей модели.
+    Возвращает начало диапазона, число вставленных строк, число
+    пропущенных, число ошибочных строк и описания первых ошибок.
+    """
+    model, columns = CSV_MODELS[filename]
+    with open(path, 'rb') as csv_file:
+        csv_file.seek(start)
+        data = csv_file.read(end - start).decode('utf-8')
+    reader = csv.DictReader(io.StringIO(data, newline=''), fieldnames=header)
+    if dry_run:
+        rows, invalid, errors = validate_rows(model, columns, reader)
+        return start, rows, 0, invalid, errors
+    rows = skipped = 0
+    with transaction.atomic():
+        for batch in read_batches(reader, batch_size):
+            objects = [build_object(model, row, columns) for row in batch]
+            if not retry:
+                model.objects.bulk_create(objects, batch_size=batch_size)
+                rows += len(objects)
+                continue
+            # Диапазоны не пересекаются по id, поэтому параллельные
+            # процессы не меняют этот подсчёт.
+            saved = model.objects.filter(pk__in=[obj.pk for obj in objects])
+            before = saved.count()
+            model.objects.bulk_create(
+                objects, batch_size=batch_size, ignore_conflicts=True
+            )
+            inserted = saved.count() - before
+            rows += inserted
+            skipped += len(objects) - inserted
+    return start, rows, skipped, 0, []
+
+
+def validate_rows(model, columns, reader):
+    # Внешние ключи не проверяются: это запрос к базе на каждую строку.
+    exclude = [
+        field.name for field in model._meta.concrete_fields
+        if field.is_relation
+    ]
+    rows = invalid = 0
+    errors = []
+    for rows, row in enumerate(reader, 1):
+        try:
+            build_object(model, row, columns).clean_fields(exclude=exclude)
+        except (ValidationError, TypeError, ValueError) as error:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f'id={row.get("id")}: {error}')
+    return rows, invalid, errors
+
+
+def reset_sequence(model):
+    """Сдвигает счётчик первичных ключей после вставки явных id."""
+    statements = connection.ops.sequence_reset_sql(no_style(), (model,))
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
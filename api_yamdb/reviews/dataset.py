@@ -0,0 +1,312 @@
+"""Генерация синтетических данных в схеме CSV-файлов static/data.
+
+Распределения приближены к реальным: число отзывов на произведение
+убывает по закону Ципфа от его популярности, активность авторов отзывов и
+комментариев подчиняется степенному закону, у произведения от одного до
+трёх жанров, популярные жанры и категории встречаются чаще. Тексты
+составляются из слов отзывов и комментариев static/data.
+
+Строки отдаются генераторами и нигде не накапливаются, поэтому память не
+зависит от объёма данных. Ранги популярности назначаются произведениям и
+пользователям перестановкой (a * i + b) mod n, чтобы популярные объекты не
+шли подряд по id и не хранить саму перестановку.
+"""
+import csv
+import math
+import random
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from reviews.models import MAX_SCORE, MIN_SCORE
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+# Столбцы файлов совпадают с файлами static/data.
+COLUMNS = {
+    'users.csv': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+ROLES = (('user', 0.989), ('moderator', 0.01), ('admin', 0.001))
+GENRES_PER_TITLE = (1, 2, 3)
+GENRES_PER_TITLE_WEIGHTS = (0.6, 0.3, 0.1)
+# Тексты склеиваются из готовых фраз: выбирать каждое слово отдельно
+# в несколько раз медленнее.
+PHRASES = 10000
+PHRASE_WORDS = (2, 6)
+FIRST_YEAR = 1920
+HISTORY_DAYS = 10 * 365
+FALLBACK_WORDS = (
+    'фильм', 'книга', 'сюжет', 'герой', 'финал', 'музыка', 'автор',
+    'смотреть', 'читать', 'отлично', 'скучно', 'история', 'жизнь',
+)
+
+
+def load_words(data_dir=DATA_DIR):
+    """Собирает словарь из текстов static/data."""
+    words = set()
+    for filename in ('review.csv', 'comments.csv', 'titles.csv'):
+        path = data_dir / filename
+        if not path.exists():
+            continue
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            for row in csv.DictReader(csv_file):
+                text = row.get('text') or row.get('name') or ''
+                words.update(re.findall(r'[а-яё]{2,}', text.lower()))
+    return sorted(words) or list(FALLBACK_WORDS)
+
+
+def load_names(filename, data_dir=DATA_DIR):
+    path = data_dir / filename
+    if not path.exists():
+        return [('Разное', 'misc')]
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        return [(row['name'], row['slug']) for row in csv.DictReader(csv_file)]
+
+
+def isoformat(moment):
+    # Формат дат static/data: 2019-09-24T21:08:21.567Z.
+    return moment.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def zipf_rank(rng, n, s):
+    """Случайный ранг от 1 до n с вероятностью, пропорциональной 1 / r^s.
+
+    Используется обращение непрерывного приближения функции
+    распределения, поэтому выбор не требует таблицы весов.
+    """
+    u = rng.random()
+    if abs(s - 1) < 1e-9:
+        rank = n ** u
+    else:
+        rank = (1 + u * (n ** (1 - s) - 1)) ** (1 / (1 - s))
+    return min(n, max(1, int(rank)))
+
+
+def harmonic(n, s):
+    """Приближённая сумма 1 / r^s по r от 1 до n."""
+    if n <= 1000:
+        return sum(rank ** -s for rank in range(1, n + 1))
+    tail = (
+        math.log(n / 1000) if abs(s - 1) < 1e-9
+        else (n ** (1 - s) - 1000 ** (1 - s)) / (1 - s)
+    )
+    return harmonic(1000, s) + tail
+
+
+class Permutation:
+    """Биекция 0..n-1 на себя без хранения таблицы."""
+
+    def __init__(self, n, rng):
+        self.n = n
+        self.a = rng.randrange(1, n) if n > 1 else 1
+        while math.gcd(self.a, n) != 1:
+            self.a += 1
+        self.b = rng.randrange(n)
+
+    def __call__(self, index):
+        return (self.a * index + self.b) % self.n
+
+
+class DatasetGenerator:
+    """Генерирует строки всех файлов с id начиная с first_ids."""
+
+    def __init__(
+        self, titles, reviews_per_title, users, comments_per_review,
+        categories, genres, title_skew=1.1, author_skew=1.2, seed=0,
+        first_ids=None, data_dir=DATA_DIR,
+    ):
+        self.titles = titles
+        self.users = users
+        self.categories = categories
+        self.genres = genres
+        self.comments_per_review = comments_per_review
+        self.title_skew = title_skew
+        self.author_skew = author_skew
+        self.seed = seed
+        self.first_ids = first_ids or {}
+        words = load_words(data_dir)
+        rng = random.Random(f'{seed}:phrases')
+        self.phrases = [
+            ' '.join(rng.choices(words, k=rng.randint(*PHRASE_WORDS)))
+            for _ in range(PHRASES)
+        ]
+        self.category_names = load_names('category.csv', data_dir)
+        self.genre_names = load_names('genre.csv', data_dir)
+        rng = random.Random(seed)
+        self.title_ranks = Permutation(titles, rng)
+        self.user_ranks = Permutation(users, rng)
+        self.reviews_scale = (
+            titles * reviews_per_title / harmonic(titles, title_skew)
+        )
+        # Даты отсчитываются от начала суток, чтобы в один день один и тот
+        # же seed давал одинаковые данные.
+        self.now = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    def first_id(self, filename):
+        return self.first_ids.get(filename, 1)
+
+    def rng(self, table):
+        return random.Random(f'{self.seed}:{table}')
+
+    def text(self, rng, low, high):
+        """Текст примерно из low-high слов."""
+        words = rng.randint(low, high)
+        phrases = rng.choices(self.phrases, k=max(1, round(words / 4)))
+        return ', '.join(phrases).capitalize() + rng.choice('.!.?.')
+
+    def date(self, rng, after=None):
+        """Случайный момент после after; недавних больше, чем давних."""
+        start = after or self.now - timedelta(days=HISTORY_DAYS)
+        return start + (self.now - start) * (1 - rng.random() ** 2)
+
+    def user_id(self, rank):
+        return self.first_id('users.csv') + self.user_ranks(rank - 1)
+
+    def review_count(self, index):
+        """Число отзывов произведения: по Ципфу от его ранга.
+
+        Дробная часть округляется по последовательности золотого сечения,
+        чтобы сумма была близка к ожидаемой и не требовала случайности.
+        """
+        rank = self.title_ranks(index) + 1
+        expected = self.reviews_scale * rank ** -self.title_skew
+        dither = (index * 0.6180339887498949) % 1
+        return min(self.users, int(expected + dither))
+
+    def named_rows(self, names, count, filename):
+        first = self.first_id(filename)
+        for index in range(count):
+            name, slug = names[index % len(names)]
+            cycle = index // len(names)
+            if cycle or first > 1:
+                name = f'{name} {cycle + 1}'
+                slug = f'{slug}-{first + index}'
+            yield {'id': first + index, 'name': name, 'slug': slug}
+
+    def generate(self, filename):
+        return getattr(self, GENERATORS[filename])()
+
+    def user_rows(self):
+        rng = self.rng('users')
+        roles, weights = zip(*ROLES)
+        first = self.first_id('users.csv')
+        for user_id in range(first, first + self.users):
+            yield {
+                'id': user_id,
+                'username': f'user{user_id}',
+                'email': f'user{user_id}@yamdb.fake',
+                'role': rng.choices(roles, weights)[0],
+                'bio': '',
+                'first_name': '',
+                'last_name': '',
+            }
+
+    def category_rows(self):
+        return self.named_rows(
+            self.category_names, self.categories, 'category.csv'
+        )
+
+    def genre_rows(self):
+        return self.named_rows(self.genre_names, self.genres, 'genre.csv')
+
+    def title_rows(self):
+        rng = self.rng('titles')
+        first = self.first_id('titles.csv')
+        category = self.first_id('category.csv')
+        last_year = self.now.year
+        for index in range(self.titles):
+            yield {
+                'id': first + index,
+                'name': self.text(rng, 1, 4).rstrip('.!?'),
+                # Новых произведений больше, чем старых.
+                'year': last_year - int(
+                    (last_year - FIRST_YEAR) * rng.random() ** 2
+                ),
+                'category': category + zipf_rank(rng, self.categories, 1) - 1,
+            }
+
+    def genre_title_rows(self):
+        rng = self.rng('genre_title')
+        row_id = self.first_id('genre_title.csv')
+        first_title = self.first_id('titles.csv')
+        first_genre = self.first_id('genre.csv')
+        for index in range(self.titles):
+            count = min(self.genres, rng.choices(
+                GENRES_PER_TITLE, GENRES_PER_TITLE_WEIGHTS
+            )[0])
+            genres = set()
+            while len(genres) < count:
+                genres.add(zipf_rank(rng, self.genres, 1))
+            for genre in sorted(genres):
+                yield {
+                    'id': row_id,
+                    'title_id': first_title + index,
+                    'genre_id': first_genre + genre - 1,
+                }
+                row_id += 1
+
+    def authors(self, rng, count):
+        """Различные авторы отзывов одного произведения."""
+        if count > self.users // 2:
+            ranks = rng.sample(range(1, self.users + 1), count)
+        else:
+            ranks = set()
+            while len(ranks) < count:
+                ranks.add(zipf_rank(rng, self.users, self.author_skew))
+        return [self.user_id(rank) for rank in ranks]
+
+    def review_and_comment_rows(self):
+        """Отдаёт пары (имя файла, строка): отзыв, затем его комментарии."""
+        rng = self.rng('reviews')
+        review_id = self.first_id('review.csv')
+        comment_id = self.first_id('comments.csv')
+        first_title = self.first_id('titles.csv')
+        # Геометрическое распределение числа комментариев со средним
+        # comments_per_review: большинство отзывов без комментариев.
+        stop = 1 / (1 + self.comments_per_review)
+        for index in range(self.titles):
+            quality = rng.gauss(7, 1.5)
+            for author in self.authors(rng, self.review_count(index)):
+                pub_date = self.date(rng)
+                yield 'review.csv', {
+                    'id': review_id,
+                    'title_id': first_title + index,
+                    'text': self.text(rng, 8, 60),
+                    'author': author,
+                    'score': min(MAX_SCORE, max(
+                        MIN_SCORE, round(rng.gauss(quality, 2))
+                    )),
+                    'pub_date': isoformat(pub_date),
+                }
+                while rng.random() > stop:
+                    yield 'comments.csv', {
+                        'id': comment_id,
+                        'review_id': review_id,
+                        'text': self.text(rng, 3, 25),
+                        'author': self.user_id(
+                            zipf_rank(rng, self.users, self.author_skew)
+                        ),
+                        'pub_date': isoformat(self.date(rng, pub_date)),
+                    }
+                    comment_id += 1
+                review_id += 1
+
+
+GENERATORS = {
+    'users.csv': 'user_rows',
+    'category.csv': 'category_rows',
+    'genre.csv': 'genre_rows',
+    'titles.csv': 'title_rows',
+    'genre_title.csv': 'genre_title_rows',
+}
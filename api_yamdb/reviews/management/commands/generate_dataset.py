@@ -0,0 +1,200 @@
+import csv
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+
+from reviews.csv_import import (
+    CSV_FILES, CSV_MODELS, build_object, read_batches, reset_sequence
+)
+from reviews.dataset import COLUMNS, GENERATORS, DatasetGenerator
+
+BATCH_SIZE = 5000
+REVIEW_FILES = ('review.csv', 'comments.csv')
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетические данные: пользователей, категории, жанры, '
+        'произведения, отзывы и комментарии с распределениями, похожими на '
+        'реальные. С --output записывает CSV-файлы в схеме static/data '
+        '(их загружает import_csv --path), иначе вставляет строки в базу '
+        'пачками после уже имеющихся.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument(
+            '--reviews-per-title', type=float, default=20,
+            help='Среднее число отзывов на произведение.'
+        )
+        parser.add_argument(
+            '--users', type=int,
+            help='Число пользователей, по умолчанию равно числу произведений.'
+        )
+        parser.add_argument(
+            '--comments-per-review', type=float, default=1,
+            help='Среднее число комментариев к отзыву.'
+        )
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument(
+            '--title-skew', type=float, default=1.1,
+            help='Показатель закона Ципфа для числа отзывов произведений.'
+        )
+        parser.add_argument(
+            '--author-skew', type=float, default=1.2,
+            help='Показатель степенного закона активности авторов.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output', type=Path, metavar='DIR',
+            help='Каталог для CSV-файлов вместо вставки в базу.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном INSERT.'
+        )
+        parser.add_argument(
+            '--skip-search-index', action='store_true',
+            help='Не перестраивать поисковый индекс после вставки.'
+        )
+
+    def handle(self, *args, **options):
+        options['users'] = options['users'] or options['titles']
+        if min(
+            options['titles'], options['users'], options['categories'],
+            options['genres'], options['batch_size'],
+        ) < 1 or min(
+            options['reviews_per_title'], options['comments_per_review']
+        ) < 0:
+            raise CommandError(
+                'Количества объектов и размер пачки должны быть '
+                'положительными, средние числа отзывов и комментариев - '
+                'неотрицательными.'
+            )
+        first_ids = {} if options['output'] else self.next_ids()
+        generator = DatasetGenerator(
+            titles=options['titles'],
+            reviews_per_title=options['reviews_per_title'],
+            users=options['users'],
+            comments_per_review=options['comments_per_review'],
+            categories=options['categories'],
+            genres=options['genres'],
+            title_skew=options['title_skew'],
+            author_skew=options['author_skew'],
+            seed=options['seed'],
+            first_ids=first_ids,
+        )
+        if options['output']:
+            self.write_csv(generator, options['output'])
+        else:
+            self.insert(generator, options)
+
+    @staticmethod
+    def next_ids():
+        """Первые свободные id таблиц, чтобы дописать данные к имеющимся."""
+        return {
+            filename: (model.objects.aggregate(last=Max('pk'))['last'] or 0)
+            + 1
+            for filename, model, _ in CSV_FILES
+        }
+
+    def report(self, filename, rows, started):
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{filename}: {rows} строк за {elapsed:.2f} с '
+            f'({rows / max(elapsed, 1e-6):.0f} строк/с)'
+        ))
+
+    def write_csv(self, generator, output):
+        output.mkdir(parents=True, exist_ok=True)
+        for filename in GENERATORS:
+            started = time.monotonic()
+            with open(
+                output / filename, 'w', encoding='utf-8', newline=''
+            ) as csv_file:
+                writer = csv.DictWriter(csv_file, COLUMNS[filename])
+                writer.writeheader()
+                rows = 0
+                for row in generator.generate(filename):
+                    writer.writerow(row)
+                    rows += 1
+            self.report(filename, rows, started)
+        started = time.monotonic()
+        counts = dict.fromkeys(REVIEW_FILES, 0)
+        files = {
+            filename: open(
+                output / filename, 'w', encoding='utf-8', newline=''
+            )
+            for filename in REVIEW_FILES
+        }
+        try:
+            writers = {
+                filename: csv.DictWriter(csv_file, COLUMNS[filename])
+                for filename, csv_file in files.items()
+            }
+            for writer in writers.values():
+                writer.writeheader()
+            for filename, row in generator.review_and_comment_rows():
+                writers[filename].writerow(row)
+                counts[filename] += 1
+        finally:
+            for csv_file in files.values():
+                csv_file.close()
+        for filename in REVIEW_FILES:
+            self.report(filename, counts[filename], started)
+
+    def insert(self, generator, options):
+        batch_size = options['batch_size']
+        for filename in GENERATORS:
+            model, columns = CSV_MODELS[filename]
+            started = time.monotonic()
+            rows = 0
+            with transaction.atomic():
+                for batch in read_batches(
+                    generator.generate(filename), batch_size
+                ):
+                    model.objects.bulk_create(
+                        [build_object(model, row, columns) for row in batch],
+                        batch_size=batch_size,
+                    )
+                    rows += len(batch)
+            reset_sequence(model)
+            self.report(filename, rows, started)
+        started = time.monotonic()
+        counts = self.insert_reviews(generator, batch_size)
+        for filename in REVIEW_FILES:
+            reset_sequence(CSV_MODELS[filename][0])
+            self.report(filename, counts[filename], started)
+        call_command('recalculate_ratings', stdout=self.stdout)
+        if not options['skip_search_index']:
+            call_command('rebuild_search_index', stdout=self.stdout)
+
+    @staticmethod
+    def insert_reviews(generator, batch_size):
+        """Вставляет отзывы пачками, а за каждой пачкой - их комментарии."""
+        pending = {filename: [] for filename in REVIEW_FILES}
+        counts = dict.fromkeys(REVIEW_FILES, 0)
+
+        def flush():
+            for filename in REVIEW_FILES:
+                model, columns = CSV_MODELS[filename]
+                model.objects.bulk_create(
+                    [build_object(model, row, columns)
+                     for row in pending[filename]],
+                    batch_size=batch_size,
+                )
+                counts[filename] += len(pending[filename])
+                pending[filename].clear()
+
+        with transaction.atomic():
+            for filename, row in generator.review_and_comment_rows():
+                pending[filename].append(row)
+                if len(pending['review.csv']) >= batch_size:
+                    flush()
+            flush()
+        return counts
@@ -0,0 +1,226 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connections, transaction
+
+from reviews.csv_import import (
+    CSV_FILES, build_object, import_chunk, plan_chunks, read_batches,
+    reset_sequence
+)
+from reviews.models import Review, Title
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+BATCH_SIZE = 5000
+CHUNK_SIZE_MB = 16
+# bulk_create не вызывает сигналы, поэтому поисковый индекс этих моделей
+# перестраивается после загрузки.
+SEARCH_INDEX_KINDS = {Title: 'title', Review: 'review'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из CSV-файлов static/data в базу данных. '
+        'По умолчанию каждый файл загружается пачками в отдельной '
+        'транзакции. С параметрами --workers, --checkpoint или --dry-run '
+        'файл делится на диапазоны, которые разбираются в пуле процессов '
+        'и фиксируются по отдельности.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', type=Path, default=DATA_DIR,
+            help='Каталог с CSV-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном INSERT.'
+        )
+        parser.add_argument(
+            '--only', nargs='+', metavar='FILE',
+            choices=[filename for filename, _, _ in CSV_FILES],
+            help='Загрузить только перечисленные файлы.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов, разбирающих диапазоны файла.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE_MB,
+            help='Размер диапазона файла в мегабайтах.'
+        )
+        parser.add_argument(
+            '--checkpoint', type=Path, metavar='DIR',
+            help=(
+                'Каталог для файлов контрольных точек. Загруженные '
+                'диапазоны записываются туда, и повторный запуск '
+                'продолжает загрузку с места сбоя.'
+            )
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только проверить и посчитать строки, ничего не записывая.'
+        )
+
+    def handle(self, *args, **options):
+        if min(
+            options['batch_size'], options['workers'], options['chunk_size']
+        ) < 1:
+            raise CommandError(
+                'Размеры пачки и диапазона и число процессов должны быть '
+                'положительными.'
+            )
+        chunked = (
+            options['workers'] > 1
+            or options['checkpoint']
+            or options['dry_run']
+        )
+        for filename, model, columns in CSV_FILES:
+            if options['only'] and filename not in options['only']:
+                continue
+            path = options['path'] / filename
+            if not path.exists():
+                raise CommandError(f'Файл {path} не найден.')
+            started = time.monotonic()
+            try:
+                if chunked:
+                    rows = self.import_chunked(filename, path, options)
+                else:
+                    rows = self.import_file(
+                        path, model, columns, options['batch_size']
+                    )
+            except IntegrityError as error:
+                raise CommandError(
+                    f'Файл {filename} не загружен, изменения отменены: {error}'
+                )
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: {rows} строк за '
+                f'{elapsed:.2f} с ({rows / max(elapsed, 1e-6):.0f} строк/с)'
+            ))
+            if not options['dry_run']:
+                self.finish_import(model)
+
+    def finish_import(self, model):
+        """Обновляет то, что bulk_create оставляет нетронутым."""
+        reset_sequence(model)
+        if model is Review:
+            call_command('recalculate_ratings', stdout=self.stdout)
+        if model in SEARCH_INDEX_KINDS:
+            call_command(
+                'rebuild_search_index',
+                kind=[SEARCH_INDEX_KINDS[model]],
+                stdout=self.stdout,
+            )
+
+    def import_file(self, path, model, columns, batch_size):
+        rows = 0
+        with open(path, encoding='utf-8', newline='') as csv_file, \
+                transaction.atomic():
+            reader = csv.DictReader(csv_file)
+            for batch in read_batches(reader, batch_size):
+                model.objects.bulk_create(
+                    [build_object(model, row, columns) for row in batch],
+                    batch_size=batch_size,
+                )
+                rows += len(batch)
+        return rows
+
+    def import_chunked(self, filename, path, options):
+        header, chunks = plan_chunks(
+            path, options['chunk_size'] * 1024 * 1024
+        )
+        checkpoint = None
+        done = None
+        if options['checkpoint'] and not options['dry_run']:
+            checkpoint = options['checkpoint'] / f'{filename}.checkpoint'
+            done = self.read_checkpoint(checkpoint, path, options)
+        # Продолжение загрузки: диапазон могли зафиксировать, но не успеть
+        # записать в контрольную точку.
+        retry = done is not None
+        jobs = [
+            (filename, str(path), start, end, header,
+             options['batch_size'], options['dry_run'], retry)
+            for start, end in chunks if start not in (done or ())
+        ]
+        if done:
+            self.stdout.write(
+                f'{filename}: пропущено {len(chunks) - len(jobs)} '
+                f'загруженных ранее диапазонов из {len(chunks)}.'
+            )
+        rows = skipped = invalid = 0
+        for start, chunk_rows, chunk_skipped, chunk_invalid, errors in (
+            self.run_jobs(jobs, options['workers'])
+        ):
+            rows += chunk_rows
+            skipped += chunk_skipped
+            invalid += chunk_invalid
+            for error in errors:
+                self.stderr.write(f'{filename}: {error}')
+            if checkpoint:
+                self.write_checkpoint(checkpoint, {'start': start})
+        if options['dry_run']:
+            self.stdout.write(
+                f'{filename}: {rows} строк, из них с ошибками: {invalid}.'
+            )
+        if skipped:
+            self.stdout.write(
+                f'{filename}: пропущено {skipped} строк, загруженных ранее.'
+            )
+        return rows
+
+    @staticmethod
+    def run_jobs(jobs, workers):
+        """Выполняет задания и отдаёт результаты по мере завершения."""
+        if workers == 1:
+            for job in jobs:
+                yield import_chunk(*job)
+            return
+        # Дочерние процессы не должны наследовать открытые соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=django.setup
+        ) as executor:
+            futures = [executor.submit(import_chunk, *job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def read_checkpoint(self, checkpoint, path, options):
+        """Возвращает начала загруженных диапазонов или None, если
+        контрольной точки ещё нет.
+
+        Первая строка файла описывает исходный файл и размер диапазона:
+        если они изменились, диапазоны уже не совпадают и продолжить
+        загрузку нельзя.
+        """
+        source = {
+            'file': str(path.resolve()),
+            'size': os.path.getsize(path),
+            'chunk_size': options['chunk_size'],
+        }
+        if not checkpoint.exists():
+            checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            self.write_checkpoint(checkpoint, source)
+            return None
+        with open(checkpoint, encoding='utf-8') as checkpoint_file:
+            lines = [json.loads(line) for line in checkpoint_file if line]
+        if lines[0] != source:
+            raise CommandError(
+                f'Контрольная точка {checkpoint} создана для другого файла '
+                'или размера диапазона. Удалите её, чтобы начать заново.'
+            )
+        return {line['start'] for line in lines[1:]}
+
+    @staticmethod
+    def write_checkpoint(checkpoint, record):
+        with open(checkpoint, 'a', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write(json.dumps(record) + '\n')
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
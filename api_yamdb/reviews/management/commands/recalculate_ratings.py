@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from reviews.models import Review, Title
+from reviews.signals import title_stats_changed
+
+BATCH_SIZE = 1000
+FIELDS = ('reviews_count', 'score_sum', 'rating', 'updated_at')
+
+
+@transaction.atomic
+def recalculate(pks):
+    """Пересчитывает статистику произведений pks в одной транзакции.
+
+    Произведения блокируются до подсчёта отзывов, как в
+    Title.recalculate_stats. Возвращает число исправленных произведений.
+    """
+    titles = list(Title.objects.select_for_update().filter(pk__in=pks).only(
+        *FIELDS
+    ))
+    stats = {
+        row['title_id']: (row['reviews_count'], row['score_sum'])
+        for row in Review.objects.filter(title_id__in=pks).values(
+            'title_id'
+        ).annotate(
+            reviews_count=Count('id'), score_sum=Sum('score')
+        ).order_by()
+    }
+    now = timezone.now()
+    changed = []
+    for title in titles:
+        reviews_count, score_sum = stats.get(title.pk, (0, 0))
+        rating = Title.calculate_rating(score_sum, reviews_count)
+        if (title.reviews_count, title.score_sum, title.rating) == (
+            reviews_count, score_sum, rating
+        ):
+            continue
+        title.reviews_count = reviews_count
+        title.score_sum = score_sum
+        title.rating = rating
+        title.updated_at = now
+        changed.append(title)
+    if changed:
+        Title.objects.bulk_update(changed, FIELDS)
+        # bulk_update не отправляет post_save: кеш произведений
+        # сбрасывается по этому сигналу.
+        title_stats_changed.send(
+            sender=Title, title_ids=[title.pk for title in changed]
+        )
+    return len(changed)
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает сохранённые рейтинг, количество отзывов и сумму '
+        'оценок произведений по таблице отзывов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help=(
+                'Количество произведений, пересчитываемых в одной '
+                'транзакции.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                Title.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not pks:
+                break
+            fixed += recalculate(pks)
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(
+            f'Исправлена статистика {fixed} произведений.'
+        ))
@@ -0,0 +1,105 @@
+# Generated by Django 3.2 on 2026-10-18 20:05
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='Идентификатор')),
+            ],
+            options={
+                'verbose_name': 'категория',
+                'verbose_name_plural': 'Категории',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации')),
+            ],
+            options={
+                'verbose_name': 'комментарий',
+                'verbose_name_plural': 'Комментарии',
+                'ordering': ('pub_date',),
+                'abstract': False,
+                'default_related_name': 'comments',
+            },
+        ),
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('slug', models.SlugField(unique=True, verbose_name='Идентификатор')),
+            ],
+            options={
+                'verbose_name': 'жанр',
+                'verbose_name_plural': 'Жанры',
+                'ordering': ('name',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+            options={
+                'verbose_name': 'жанр произведения',
+                'verbose_name_plural': 'Жанры произведений',
+            },
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата публикации')),
+                ('score', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Оценка')),
+            ],
+            options={
+                'verbose_name': 'отзыв',
+                'verbose_name_plural': 'Отзывы',
+                'ordering': ('pub_date',),
+                'abstract': False,
+                'default_related_name': 'reviews',
+            },
+        ),
+        migrations.CreateModel(
+            name='Title',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256, verbose_name='Название')),
+                ('year', models.SmallIntegerField(validators=[reviews.validators.validate_year], verbose_name='Год выпуска')),
+                ('description', models.TextField(blank=True, verbose_name='Описание')),
+                ('rating', models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Рейтинг')),
+                ('reviews_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов')),
+                ('score_sum', models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='titles', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ManyToManyField(related_name='titles', through='reviews.GenreTitle', to='reviews.Genre', verbose_name='Жанр')),
+            ],
+            options={
+                'verbose_name': 'произведение',
+                'verbose_name_plural': 'Произведения',
+                'ordering': ('name',),
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 20:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'default_related_name': 'comments', 'ordering': ('pub_date', 'id'), 'verbose_name': 'комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+        migrations.AlterModelOptions(
+            name='review',
+            options={'default_related_name': 'reviews', 'ordering': ('pub_date', 'id'), 'verbose_name': 'отзыв', 'verbose_name_plural': 'Отзывы'},
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', 'pub_date', 'id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', 'pub_date', 'id'], name='review_title_pub_date_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2 on 2026-10-18 20:25
+
+from django.db import migrations, models
+
+NAME_INDEX = 'title_name_search_idx'
+
+
+def create_name_index(apps, schema_editor):
+    """Создаёт индекс для фильтров name и name_prefix.
+
+    В PostgreSQL это триграммный GIN-индекс по UPPER(name): его использует
+    и поиск подстроки (icontains), и поиск по началу (istartswith).
+    SQLite триграмм не умеет, поэтому там создаётся индекс с NOCASE,
+    который ускоряет только поиск по началу названия.
+    """
+    table = apps.get_model('reviews', 'Title')._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX {NAME_INDEX} ON {table} '
+            'USING gin (UPPER(name::text) gin_trgm_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE INDEX {NAME_INDEX} ON {table} (name COLLATE NOCASE)'
+        )
+
+
+def drop_name_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {NAME_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genre_title_genre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+        migrations.RunPython(create_name_index, drop_name_index),
+    ]
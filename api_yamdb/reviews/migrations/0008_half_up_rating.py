@@ -0,0 +1,31 @@
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F
+from django.db.models.functions import Now
+
+
+def recalculate_ratings(apps, schema_editor):
+    """Пересчитывает сохранённый рейтинг с округлением половины вверх.
+
+    Раньше рейтинг округлялся round() (7,5 -> 8, но 6,5 -> 6). Сумма
+    оценок и число отзывов не менялись, поэтому рейтинг считается из
+    них одним UPDATE только для строк, где он отличается.
+    """
+    Title = apps.get_model('reviews', 'Title')
+    rating = ExpressionWrapper(
+        (2 * F('score_sum') + F('reviews_count')) / (2 * F('reviews_count')),
+        output_field=models.IntegerField(),
+    )
+    Title.objects.using(schema_editor.connection.alias).filter(
+        reviews_count__gt=0
+    ).exclude(rating=rating).update(rating=rating, updated_at=Now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_review_score_range'),
+    ]
+
+    operations = [
+        migrations.RunPython(recalculate_ratings, migrations.RunPython.noop),
+    ]
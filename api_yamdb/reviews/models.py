@@ -0,0 +1,263 @@
+from django.contrib.auth import get_user_model
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, Q, Sum, When
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from reviews.signals import title_stats_changed
+from reviews.validators import validate_year
+
+User = get_user_model()
+
+NAME_MAX_LENGTH = 256
+SLUG_MAX_LENGTH = 50
+MIN_SCORE = 1
+MAX_SCORE = 10
+TEXT_PREVIEW_LENGTH = 30
+
+
+class CategoryGenreBase(models.Model):
+    name = models.CharField('Название', max_length=NAME_MAX_LENGTH)
+    slug = models.SlugField(
+        'Идентификатор', max_length=SLUG_MAX_LENGTH, unique=True
+    )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ('name',)
+
+    def __str__(self):
+        return self.name
+
+
+class Category(CategoryGenreBase):
+
+    class Meta(CategoryGenreBase.Meta):
+        verbose_name = 'категория'
+        verbose_name_plural = 'Категории'
+
+
+class Genre(CategoryGenreBase):
+
+    class Meta(CategoryGenreBase.Meta):
+        verbose_name = 'жанр'
+        verbose_name_plural = 'Жанры'
+
+
+class Title(models.Model):
+    name = models.CharField('Название', max_length=NAME_MAX_LENGTH)
+    year = models.SmallIntegerField('Год выпуска', validators=(validate_year,))
+    description = models.TextField('Описание', blank=True)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='titles',
+        verbose_name='Категория',
+    )
+    genre = models.ManyToManyField(
+        Genre,
+        through='GenreTitle',
+        related_name='titles',
+        verbose_name='Жанр',
+    )
+    # Статистика отзывов хранится в самом произведении и поддерживается
+    # при каждом изменении отзыва, чтобы списки не агрегировали отзывы.
+    rating = models.PositiveSmallIntegerField(
+        'Рейтинг', null=True, blank=True, editable=False
+    )
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0, editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения', auto_now=True, db_index=True
+    )
+
+    class Meta:
+        ordering = ('name',)
+        verbose_name = 'произведение'
+        verbose_name_plural = 'Произведения'
+        # Индекс по названию зависит от СУБД и создаётся в миграции
+        # 0006_title_filter_indexes.
+        indexes = (
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+        )
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def calculate_rating(score_sum, reviews_count):
+        # Округление половины вверх в целых числах, как в rating_expression.
+        if not reviews_count:
+            return None
+        return (2 * score_sum + reviews_count) // (2 * reviews_count)
+
+    @staticmethod
+    def rating_expression(score_delta, count_delta):
+        """Выражение SQL для нового рейтинга после сдвига статистики.
+
+        Значения столбцов в UPDATE берутся до изменения строки, поэтому
+        сдвиги прибавляются явно.
+        """
+        score_sum = F('score_sum') + score_delta
+        reviews_count = F('reviews_count') + count_delta
+        return Case(
+            When(reviews_count__gt=-count_delta, then=ExpressionWrapper(
+                (2 * score_sum + reviews_count) / (2 * reviews_count),
+                output_field=models.IntegerField(),
+            )),
+            default=None,
+            output_field=models.IntegerField(),
+        )
+
+    @classmethod
+    def apply_review_change(cls, title_id, score_delta, count_delta=0):
+        """Сдвигает статистику отзывов произведения и пересчитывает рейтинг.
+
+        Всё делает один UPDATE, поэтому одновременные изменения отзывов не
+        теряют обновлений, а строка остаётся заблокированной до конца
+        транзакции. Возвращает число изменённых строк: 0, если произведения
+        нет.
+        """
+        updated = cls.objects.filter(pk=title_id).update(
+            score_sum=F('score_sum') + score_delta,
+            reviews_count=F('reviews_count') + count_delta,
+            rating=cls.rating_expression(score_delta, count_delta),
+            updated_at=timezone.now(),
+        )
+        if updated:
+            title_stats_changed.send(sender=cls, title_ids=[title_id])
+        return updated
+
+    @classmethod
+    @transaction.atomic
+    def recalculate_stats(cls, title_id):
+        """Пересчитывает статистику произведения по таблице отзывов.
+
+        Строка произведения блокируется до подсчёта, поэтому отзыв,
+        добавляемый одновременно (apply_review_change), либо уже учтён,
+        либо ждёт конца транзакции. Возвращает 0, если произведения нет.
+        """
+        if not cls.objects.select_for_update().filter(pk=title_id).exists():
+            return 0
+        stats = Review.objects.filter(title_id=title_id).aggregate(
+            reviews_count=Count('id'), score_sum=Coalesce(Sum('score'), 0)
+        )
+        cls.objects.filter(pk=title_id).update(
+            rating=cls.calculate_rating(**stats),
+            updated_at=timezone.now(),
+            **stats,
+        )
+        title_stats_changed.send(sender=cls, title_ids=[title_id])
+        return 1
+
+
+class GenreTitle(models.Model):
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, verbose_name='Произведение'
+    )
+    genre = models.ForeignKey(
+        Genre, on_delete=models.CASCADE, verbose_name='Жанр'
+    )
+
+    class Meta:
+        verbose_name = 'жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'genre'), name='unique_genre_title'
+            ),
+        )
+        # Уникальный индекс начинается с title; фильтру по жанру нужен
+        # индекс, начинающийся с genre и содержащий title целиком.
+        indexes = (
+            models.Index(
+                fields=('genre', 'title'), name='genre_title_genre_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title} - {self.genre}'
+
+
+class AuthorTextBase(models.Model):
+    text = models.TextField('Текст')
+    author = models.ForeignKey(
+        User, on_delete=models.CASCADE, verbose_name='Автор'
+    )
+    pub_date = models.DateTimeField(
+        'Дата публикации',
+        default=timezone.now,
+        editable=False,
+        db_index=True,
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения', auto_now=True, db_index=True
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ('pub_date', 'id')
+
+    def __str__(self):
+        return self.text[:TEXT_PREVIEW_LENGTH]
+
+
+class Review(AuthorTextBase):
+    title = models.ForeignKey(
+        Title, on_delete=models.CASCADE, verbose_name='Произведение'
+    )
+    score = models.PositiveSmallIntegerField(
+        'Оценка',
+        validators=(
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE),
+        ),
+    )
+
+    class Meta(AuthorTextBase.Meta):
+        default_related_name = 'reviews'
+        verbose_name = 'отзыв'
+        verbose_name_plural = 'Отзывы'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'author'), name='unique_review'
+            ),
+            models.CheckConstraint(
+                check=Q(score__gte=MIN_SCORE, score__lte=MAX_SCORE),
+                name='review_score_range',
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
+
+
+class Comment(AuthorTextBase):
+    review = models.ForeignKey(
+        Review, on_delete=models.CASCADE, verbose_name='Отзыв'
+    )
+
+    class Meta(AuthorTextBase.Meta):
+        default_related_name = 'comments'
+        verbose_name = 'комментарий'
+        verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
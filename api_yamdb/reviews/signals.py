@@ -0,0 +1,34 @@
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import Signal, receiver
+
+# Статистика отзывов произведений изменилась запросом UPDATE, который не
+# отправляет post_save; аргумент title_ids - список id произведений.
+title_stats_changed = Signal()
+
+# Произведения, которые удаляются сейчас. Их отзывы удаляются каскадом
+# раньше самих произведений, и сдвигать статистику незачем.
+deleting_titles = ContextVar('deleting_titles', default=frozenset())
+
+
+@receiver(pre_delete, sender='reviews.Title')
+def remember_deleting_title(sender, instance, **kwargs):
+    deleting_titles.set(deleting_titles.get() | {instance.pk})
+
+
+@receiver(post_delete, sender='reviews.Title')
+def forget_deleting_title(sender, instance, **kwargs):
+    deleting_titles.set(deleting_titles.get() - {instance.pk})
+
+
+@receiver(post_delete, sender='reviews.Review')
+def recalculate_title_stats(sender, instance, **kwargs):
+    # Отзыв удаляется и сам, и каскадом вместе с автором, поэтому
+    # статистика обновляется здесь, а не в представлении. Она
+    # пересчитывается, а не сдвигается: отзывы из админки и import_csv
+    # в неё не попадают до recalculate_ratings.
+    if instance.title_id in deleting_titles.get():
+        return
+    title_model = sender._meta.get_field('title').related_model
+    title_model.recalculate_stats(instance.title_id)
@@ -0,0 +1,102 @@
+"""Полнотекстовый поиск по произведениям и отзывам.
+
+В SQLite поиск идёт по таблице FTS5: каждое слово запроса ищется как
+префикс, а у русских слов перед этим отбрасываются конечные гласные, чтобы
+«звезда» находила и «звёзды», и «звездой». В PostgreSQL текст разбирается
+одновременно русским и английским словарями, а запрос понимает синтаксис
+websearch. В обоих случаях буква «ё» приравнивается к «е», а результаты
+упорядочиваются по релевантности. На остальных СУБД поиск сводится к
+icontains по словам запроса без ранжирования.
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Replace
+
+from search.models import SearchDocument
+
+FTS_TABLE = 'search_searchdocument_fts'
+VECTOR_INDEX = 'search_document_vector_idx'
+SEARCH_CONFIGS = ('russian', 'english')
+WORD_RE = re.compile(r'\w+')
+RUSSIAN_ENDING_RE = re.compile('[аеиоуыэюяйь]+$')
+MIN_STEM_LENGTH = 3
+
+
+def normalize(text):
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def normalized_text():
+    return Replace(
+        Replace(F('text'), Value('ё'), Value('е')), Value('Ё'), Value('Е')
+    )
+
+
+def search_vector():
+    """Выражение tsvector, по которому построен GIN-индекс в PostgreSQL."""
+    from django.contrib.postgres.search import SearchVector
+
+    text = normalized_text()
+    vector = SearchVector(text, config=SEARCH_CONFIGS[0])
+    for config in SEARCH_CONFIGS[1:]:
+        vector = vector + SearchVector(text, config=config)
+    return vector
+
+
+def query_terms(query):
+    terms = []
+    for word in WORD_RE.findall(normalize(query).lower()):
+        stem = RUSSIAN_ENDING_RE.sub('', word)
+        terms.append(stem if len(stem) >= MIN_STEM_LENGTH else word)
+    return terms
+
+
+def search_documents(query, kinds=None):
+    """Возвращает документы, подходящие под запрос, с полем rank."""
+    queryset = SearchDocument.objects.all()
+    if kinds:
+        queryset = queryset.filter(kind__in=kinds)
+    terms = query_terms(query)
+    if not terms:
+        return queryset.none()
+    if connection.vendor == 'sqlite':
+        return sqlite_search(queryset, terms)
+    if connection.vendor == 'postgresql':
+        return postgresql_search(queryset, query)
+    condition = Q()
+    for term in terms:
+        condition &= Q(text__icontains=term)
+    return queryset.filter(condition).annotate(
+        rank=Value(0.0, output_field=FloatField())
+    ).order_by('id')
+
+
+def sqlite_search(queryset, terms):
+    table = SearchDocument._meta.db_table
+    return queryset.extra(
+        tables=(FTS_TABLE,),
+        where=(f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'),
+        params=(' '.join(f'"{term}"*' for term in terms),),
+        # bm25() тем меньше, чем документ релевантнее.
+        select={'rank': f'-bm25({FTS_TABLE})'},
+    ).order_by('-rank', 'id')
+
+
+def postgresql_search(queryset, query):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    search_query = None
+    for config in SEARCH_CONFIGS:
+        config_query = SearchQuery(
+            normalize(query), config=config, search_type='websearch'
+        )
+        search_query = (
+            config_query if search_query is None
+            else search_query | config_query
+        )
+    vector = search_vector()
+    return queryset.annotate(
+        vector=vector, rank=SearchRank(vector, search_query)
+    ).filter(vector=search_query).order_by('-rank', 'id')
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Review, Title
+from search.models import KIND_CHOICES, REVIEW, TITLE, SearchDocument
+
+BATCH_SIZE = 5000
+INDEXED_MODELS = {TITLE: Title, REVIEW: Review}
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает поисковый индекс произведений и отзывов. Нужна после '
+        'загрузки данных в обход моделей, например командой import_csv.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--kind', nargs='+', choices=[kind for kind, _ in KIND_CHOICES],
+            help='Перестроить только документы указанных типов.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество документов в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for kind in options['kind'] or INDEXED_MODELS:
+            with transaction.atomic():
+                SearchDocument.objects.filter(kind=kind).delete()
+                documents = []
+                count = 0
+                for instance in INDEXED_MODELS[kind].objects.order_by(
+                    'pk'
+                ).iterator(chunk_size=batch_size):
+                    documents.append(SearchDocument.for_object(instance))
+                    if len(documents) == batch_size:
+                        SearchDocument.objects.bulk_create(documents)
+                        count += len(documents)
+                        documents = []
+                SearchDocument.objects.bulk_create(documents)
+                count += len(documents)
+            self.stdout.write(self.style.SUCCESS(
+                f'{INDEXED_MODELS[kind]._meta.verbose_name_plural}: '
+                f'проиндексировано {count}.'
+            ))
@@ -0,0 +1,81 @@
+# Generated by Django 3.2 on 2026-10-18 20:28
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+FTS_TABLE = 'search_searchdocument_fts'
+VECTOR_INDEX = 'search_document_vector_idx'
+# FTS5 хранит собственную копию текста, в которой «ё» заменена на «е»:
+# unicode61 не приравнивает эти буквы.
+NORMALIZED_TEXT = "replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')"
+SQLITE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"text, tokenize='unicode61 remove_diacritics 2')",
+    f'CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT '
+    f'ON search_searchdocument BEGIN '
+    f'INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, {NORMALIZED_TEXT}); '
+    f'END',
+    f'CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE '
+    f'ON search_searchdocument BEGIN '
+    f'DELETE FROM {FTS_TABLE} WHERE rowid = old.id; '
+    f'INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, {NORMALIZED_TEXT}); '
+    f'END',
+    f'CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE '
+    f'ON search_searchdocument BEGIN '
+    f'DELETE FROM {FTS_TABLE} WHERE rowid = old.id; '
+    f'END',
+)
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_STATEMENTS:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+
+        from search.backends import search_vector
+        schema_editor.add_index(
+            apps.get_model('search', 'SearchDocument'),
+            GinIndex(search_vector(), name=VECTOR_INDEX),
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {VECTOR_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('reviews', '0006_title_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('title', 'произведение'), ('review', 'отзыв')], max_length=16, verbose_name='Тип')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Идентификатор объекта')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,94 @@
+from django.db import models
+
+from reviews.models import Review, Title
+
+TITLE = 'title'
+REVIEW = 'review'
+KIND_CHOICES = (
+    (TITLE, 'произведение'),
+    (REVIEW, 'отзыв'),
+)
+
+
+class SearchDocument(models.Model):
+    """Текст объекта, по которому ведётся полнотекстовый поиск.
+
+    Сам полнотекстовый индекс зависит от СУБД и создаётся в миграции:
+    в SQLite это таблица FTS5, которую заполняют триггеры, в PostgreSQL -
+    GIN-индекс по tsvector. SQLite пересоздаёт таблицу при изменении
+    полей, а вместе с ней и триггеры, поэтому миграции этой модели должны
+    создавать их заново.
+    """
+
+    kind = models.CharField('Тип', max_length=16, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField('Идентификатор объекта')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='search_documents',
+        verbose_name='Произведение',
+    )
+    text = models.TextField('Текст')
+
+    class Meta:
+        verbose_name = 'поисковый документ'
+        verbose_name_plural = 'Поисковые документы'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('kind', 'object_id'), name='unique_search_document'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}'
+
+    @classmethod
+    def from_title(cls, title):
+        return cls(
+            kind=TITLE,
+            object_id=title.pk,
+            title_id=title.pk,
+            text=f'{title.name}\n{title.description}',
+        )
+
+    @classmethod
+    def from_review(cls, review):
+        return cls(
+            kind=REVIEW,
+            object_id=review.pk,
+            title_id=review.title_id,
+            text=review.text,
+        )
+
+    @classmethod
+    def for_object(cls, instance):
+        if isinstance(instance, Title):
+            return cls.from_title(instance)
+        if isinstance(instance, Review):
+            return cls.from_review(instance)
+        raise TypeError(f'{type(instance).__name__} не индексируется.')
+
+    @classmethod
+    def index(cls, instance):
+        document = cls.for_object(instance)
+        cls.objects.update_or_create(
+            kind=document.kind,
+            object_id=document.object_id,
+            defaults={'title_id': document.title_id, 'text': document.text},
+        )
+
+    @classmethod
+    def index_new(cls, instances):
+        """Индексирует новые объекты одним запросом.
+
+        bulk_create не отправляет post_save, поэтому пакетная вставка
+        индексирует объекты сама.
+        """
+        cls.objects.bulk_create(map(cls.for_object, instances))
+
+    @classmethod
+    def unindex(cls, instance):
+        document = cls.for_object(instance)
+        cls.objects.filter(
+            kind=document.kind, object_id=document.object_id
+        ).delete()
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews.models import Review, Title
+from search.models import SearchDocument
+
+TITLE_INDEXED_FIELDS = frozenset(('name', 'description'))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Review)
+def index_object(sender, instance, created, update_fields=None, **kwargs):
+    # У нового объекта документа ещё нет: хватает одной вставки.
+    if created:
+        SearchDocument.index_new([instance])
+        return
+    # Обновление статистики отзывов не меняет текст произведения.
+    if (
+        sender is Title and update_fields
+        and not TITLE_INDEXED_FIELDS & set(update_fields)
+    ):
+        return
+    SearchDocument.index(instance)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def unindex_object(sender, instance, **kwargs):
+    SearchDocument.unindex(instance)
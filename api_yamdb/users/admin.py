@@ -0,0 +1,15 @@
+from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+
+from users.models import User
+
+
+@admin.register(User)
+class YamdbUserAdmin(UserAdmin):
+    list_display = ('username', 'email', 'role', 'first_name', 'last_name')
+    list_editable = ('role',)
+    search_fields = ('username', 'email')
+    list_filter = ('role',)
+    fieldsets = UserAdmin.fieldsets + (
+        ('YaMDb', {'fields': ('role', 'bio')}),
+    )
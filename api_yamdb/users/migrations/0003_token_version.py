@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия токенов'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 20:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_token_version'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='confirmation_code',
+        ),
+    ]
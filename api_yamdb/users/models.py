@@ -0,0 +1,57 @@
+from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import models
+
+from users.validators import validate_username
+
+USERNAME_MAX_LENGTH = 150
+EMAIL_MAX_LENGTH = 254
+
+
+class User(AbstractUser):
+    USER = 'user'
+    MODERATOR = 'moderator'
+    ADMIN = 'admin'
+    ROLE_CHOICES = (
+        (USER, 'Пользователь'),
+        (MODERATOR, 'Модератор'),
+        (ADMIN, 'Администратор'),
+    )
+
+    username = models.CharField(
+        'Имя пользователя',
+        max_length=USERNAME_MAX_LENGTH,
+        unique=True,
+        validators=(UnicodeUsernameValidator(), validate_username),
+    )
+    email = models.EmailField(
+        'Электронная почта', max_length=EMAIL_MAX_LENGTH, unique=True
+    )
+    bio = models.TextField('Биография', blank=True)
+    role = models.CharField(
+        'Роль',
+        max_length=max(len(role) for role, _ in ROLE_CHOICES),
+        choices=ROLE_CHOICES,
+        default=USER,
+    )
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
+    # Входит в выданные токены; увеличивается, чтобы отозвать их.
+    token_version = models.PositiveIntegerField(
+        'Версия токенов', default=0, editable=False
+    )
+
+    class Meta:
+        ordering = ('username',)
+        verbose_name = 'пользователь'
+        verbose_name_plural = 'Пользователи'
+
+    def __str__(self):
+        return self.username
+
+    @property
+    def is_admin(self):
+        return self.role == self.ADMIN or self.is_superuser or self.is_staff
+
+    @property
+    def is_moderator(self):
+        return self.role == self.MODERATOR
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.utils.http import base36_to_int
+
+
+class ConfirmationCodeGenerator(PasswordResetTokenGenerator):
+    """Коды подтверждения, которые не нужно хранить в базе.
+
+    Код - это HMAC от идентификатора, email, пароля, времени последнего
+    входа и версии токенов пользователя с меткой времени, как у токенов
+    сброса пароля. Получение JWT обновляет last_login, после чего выданные
+    коды перестают подходить; кроме того, код действует не дольше
+    CONFIRMATION_CODE_TIMEOUT секунд.
+    """
+
+    key_salt = 'users.tokens.ConfirmationCodeGenerator'
+
+    def _make_hash_value(self, user, timestamp):
+        return (
+            super()._make_hash_value(user, timestamp)
+            + str(user.token_version)
+        )
+
+    def check_token(self, user, token):
+        if not super().check_token(user, token):
+            return False
+        timestamp = base36_to_int(token.split('-')[0])
+        return (
+            self._num_seconds(self._now()) - timestamp
+            <= settings.CONFIRMATION_CODE_TIMEOUT
+        )
+
+
+confirmation_code_generator = ConfirmationCodeGenerator()
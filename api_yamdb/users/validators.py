@@ -0,0 +1,11 @@
+from django.core.exceptions import ValidationError
+
+FORBIDDEN_USERNAMES = ('me',)
+
+
+def validate_username(value):
+    if value.lower() in FORBIDDEN_USERNAMES:
+        raise ValidationError(
+            f'Использовать имя `{value}` в качестве username запрещено.'
+        )
+    return value
@@ -0,0 +1,316 @@
+"""Замер API на смеси операций из спецификации redoc.yaml.
+
+Скрипт наполняет отдельную базу синтетическими данными (benchmarks/seed.py)
+и отправляет --requests запросов, выбирая операции спецификации с весами
+из MIX. Запросы обрабатываются приложением в том же процессе, через
+тестовый клиент Django, поэтому сеть в замер не попадает, а запросы к базе
+каждого ответа подсчитываются. Для каждой операции печатаются число
+запросов, p50/p95/p99 задержки, пропускная способность одного клиента,
+среднее число запросов к базе и коды ответов; результаты сохраняются в
+JSON, который можно сравнить с результатами другого коммита:
+
+    python benchmarks/api_suite.py --output before.json
+    git checkout <другой коммит>
+    python benchmarks/api_suite.py --output after.json --compare before.json
+
+Операции спецификации, которых нет в MIX (удаление и изменение каталога
+администратором), не выполняются: они меняли бы данные под остальными
+запросами. Их список сохраняется в результатах.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import yaml
+
+from common import PROJECT_DIR, percentile, setup_django
+from seed import seed_dataset
+
+SPEC_PATH = PROJECT_DIR / 'static' / 'redoc.yaml'
+API_PREFIX = '/api/v1'
+WRITERS = 200
+SAMPLE_USERS = 50
+# Относительные частоты операций: в основном читают каталог и отзывы,
+# пишут заметно реже.
+MIX = {
+    'GET /titles/': 25,
+    'GET /titles/{titles_id}/': 15,
+    'GET /titles/{title_id}/reviews/': 15,
+    'GET /titles/{title_id}/reviews/{review_id}/': 5,
+    'GET /titles/{title_id}/reviews/{review_id}/comments/': 8,
+    'GET /titles/{title_id}/reviews/{review_id}/comments/{comment_id}/': 2,
+    'GET /categories/': 5,
+    'GET /genres/': 5,
+    'GET /users/me/': 3,
+    'POST /titles/{title_id}/reviews/': 3,
+    'PATCH /titles/{title_id}/reviews/{review_id}/': 1,
+    'POST /titles/{title_id}/reviews/{review_id}/comments/': 4,
+    'POST /auth/signup/': 1,
+    'POST /auth/token/': 1,
+    'GET /users/': 1,
+    'GET /users/{username}/': 1,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=20000)
+    parser.add_argument('--comments', type=int, default=40000)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path)
+    return parser.parse_args()
+
+
+def spec_operations():
+    with open(SPEC_PATH, encoding='utf-8') as redoc:
+        spec = yaml.safe_load(redoc)
+    return [
+        f'{method.upper()} {path}'
+        for path, operations in spec['paths'].items()
+        for method in operations if method != 'parameters'
+    ]
+
+
+class Workload:
+    """Собирает запросы операций по данным, созданным seed_dataset."""
+
+    def __init__(self, dataset, rng):
+        from django.contrib.auth import get_user_model
+
+        from api.authentication import UserAccessToken
+
+        User = get_user_model()
+        self.dataset = dataset
+        self.rng = rng
+        self.counter = Counter()
+        admin = User.objects.create(
+            username='bench-admin', email='admin@yamdb.fake', role=User.ADMIN
+        )
+        self.admin_token = str(UserAccessToken.for_user(admin))
+        User.objects.bulk_create(
+            User(username=f'writer{index}', email=f'writer{index}@yamdb.fake')
+            for index in range(WRITERS)
+        )
+        self.writer_tokens = [
+            str(UserAccessToken.for_user(user))
+            for user in User.objects.filter(username__startswith='writer')
+        ]
+        self.users = list(User.objects.filter(
+            username__in=rng.sample(dataset.usernames, SAMPLE_USERS)
+        ))
+        self.user_tokens = [
+            str(UserAccessToken.for_user(user)) for user in self.users
+        ]
+
+    def path_params(self, path):
+        """Выбирает согласованные идентификаторы для параметров пути."""
+        if '{comment_id}' in path:
+            title_id, review_id, comment_id = self.rng.choice(
+                self.dataset.comments
+            )
+        else:
+            title_id, review_id = self.rng.choice(self.dataset.reviews)
+            comment_id = None
+        return {
+            'title_id': title_id,
+            'titles_id': title_id,
+            'review_id': review_id,
+            'comment_id': comment_id,
+            'username': self.rng.choice(self.dataset.usernames),
+        }
+
+    def build(self, operation):
+        """Возвращает (метод, адрес, тело, токен) запроса операции."""
+        from users.tokens import confirmation_code_generator
+
+        method, path = operation.split(' ', 1)
+        params = self.path_params(path)
+        number = self.counter[operation]
+        self.counter[operation] += 1
+        data, token = None, None
+        if operation == 'POST /titles/{title_id}/reviews/':
+            # Каждый писатель оставляет отзыв на произведение один раз.
+            token = self.writer_tokens[number % WRITERS]
+            titles = self.dataset.title_ids
+            params['title_id'] = titles[number // WRITERS % len(titles)]
+            data = {
+                'text': 'Отзыв из замера', 'score': self.rng.randint(1, 10)
+            }
+        elif method == 'PATCH':
+            token = self.admin_token
+            data = {'score': self.rng.randint(1, 10)}
+        elif method == 'POST' and path.endswith('/comments/'):
+            token = self.rng.choice(self.user_tokens)
+            data = {'text': 'Комментарий из замера'}
+        elif path == '/auth/signup/':
+            data = {
+                'username': f'bench{number}',
+                'email': f'bench{number}@yamdb.fake',
+            }
+        elif path == '/auth/token/':
+            user = self.rng.choice(self.users)
+            user.refresh_from_db()
+            data = {
+                'username': user.username,
+                'confirmation_code': confirmation_code_generator.make_token(
+                    user
+                ),
+            }
+        elif path == '/users/me/':
+            token = self.rng.choice(self.user_tokens)
+        elif path.startswith('/users/'):
+            token = self.admin_token
+        return method, API_PREFIX + path.format(**params), data, token
+
+
+def send(client, method, url, data, token):
+    extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+    if data is None:
+        return client.generic(method, url, **extra)
+    return client.generic(
+        method, url, json.dumps(data), 'application/json', **extra
+    )
+
+
+def replay(workload, operations, weights, count, warmup, rng):
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    samples = defaultdict(lambda: {
+        'timings': [], 'queries': [], 'statuses': Counter()
+    })
+    started = None
+    for index in range(warmup + count):
+        if index == warmup:
+            started = time.perf_counter()
+        operation = rng.choices(operations, weights)[0]
+        request = workload.build(operation)
+        request_started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = send(client, *request)
+        elapsed = (time.perf_counter() - request_started) * 1000
+        if index < warmup:
+            continue
+        sample = samples[operation]
+        sample['timings'].append(elapsed)
+        sample['queries'].append(len(queries))
+        sample['statuses'][str(response.status_code)] += 1
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples):
+    endpoints = {}
+    for operation, sample in sorted(samples.items()):
+        timings = sorted(sample['timings'])
+        total = sum(timings)
+        endpoints[operation] = {
+            'requests': len(timings),
+            'p50_ms': round(percentile(timings, 0.5), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'p99_ms': round(percentile(timings, 0.99), 3),
+            'rps': round(len(timings) / total * 1000, 1),
+            'queries': round(sum(sample['queries']) / len(timings), 2),
+            'max_queries': max(sample['queries']),
+            'statuses': dict(sorted(sample['statuses'].items())),
+        }
+    return endpoints
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results, baseline=None):
+    print(
+        f'{results["total"]["requests"]} запросов: '
+        f'{results["total"]["rps"]} запросов/с'
+    )
+    columns = ('p50_ms', 'p95_ms', 'p99_ms', 'rps', 'queries')
+    print('операция'.ljust(70) + ''.join(name.rjust(10) for name in columns))
+    for operation, row in results['endpoints'].items():
+        line = operation.ljust(70) + ''.join(
+            f'{row[name]:10.2f}' for name in columns
+        )
+        old = (baseline or {}).get('endpoints', {}).get(operation)
+        if old:
+            line += '  было:' + ''.join(
+                f'{old[name]:10.2f}' for name in columns
+            )
+        statuses = ', '.join(
+            f'{status}: {count}' for status, count in row['statuses'].items()
+        )
+        print(f'{line}  [{statuses}]')
+
+
+def main():
+    args = parse_args()
+    operations = spec_operations()
+    unknown = set(MIX) - set(operations)
+    if unknown:
+        sys.exit(f'Операций нет в спецификации: {", ".join(sorted(unknown))}')
+    setup_django()
+    from django import get_version
+    from django.db import connection
+
+    started = time.perf_counter()
+    dataset = seed_dataset(
+        args.users, args.titles, args.reviews, args.comments, args.seed
+    )
+    print(f'Данные созданы за {time.perf_counter() - started:.1f} с.')
+    rng = random.Random(args.seed)
+    workload = Workload(dataset, rng)
+    samples, elapsed = replay(
+        workload, list(MIX), list(MIX.values()), args.requests, args.warmup,
+        rng,
+    )
+    results = {
+        'meta': {
+            'commit': commit(),
+            'python': platform.python_version(),
+            'django': get_version(),
+            'database': connection.vendor,
+            'args': {
+                name: value for name, value in vars(args).items()
+                if name not in ('output', 'compare')
+            },
+            'skipped': sorted(set(operations) - set(MIX)),
+        },
+        'total': {
+            'requests': args.requests,
+            'rps': round(args.requests / elapsed, 1),
+        },
+        'endpoints': summarize(samples),
+    }
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+    print_report(results, baseline)
+    if args.output:
+        args.output.write_text(
+            json.dumps(results, ensure_ascii=False, indent=2) + '\n',
+            encoding='utf-8',
+        )
+
+
+if __name__ == '__main__':
+    main()
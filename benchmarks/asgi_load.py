@@ -0,0 +1,126 @@
+"""Нагрузочный тест списков API при многих одновременных соединениях.
+
+Скрипт открывает --connections соединений keep-alive к уже запущенному
+серверу, в течение --duration секунд отправляет по ним GET-запросы к --url
+по кругу и печатает запросы в секунду, p50/p95/p99 задержки и число
+ошибок. Чтобы сравнить WSGI и ASGI, запустите один и тот же тест против
+обоих серверов:
+
+    gunicorn api_yamdb.wsgi:application --workers 4 --threads 8
+    uvicorn api_yamdb.asgi:application --workers 4
+
+    python benchmarks/asgi_load.py --connections 1000 --duration 30 \\
+        --url http://127.0.0.1:8000/api/v1/titles/ \\
+        --url http://127.0.0.1:8000/api/v1/titles/1/reviews/
+
+Для 1000 соединений нужен лимит открытых файлов выше 1024 (ulimit -n).
+"""
+import argparse
+import asyncio
+import time
+from itertools import cycle
+from urllib.parse import urlsplit
+
+from common import percentile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', action='append')
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--timeout', type=float, default=10)
+    args = parser.parse_args()
+    args.url = args.url or ['http://127.0.0.1:8000/api/v1/titles/']
+    return args
+
+
+async def read_body(reader, headers):
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                return
+    await reader.readexactly(int(headers.get('content-length', 0)))
+
+
+async def fetch(reader, writer, host, path):
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+        'Accept: application/json\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode('latin1').strip()
+        if not line:
+            break
+        name, _, value = line.partition(':')
+        headers[name.lower()] = value.strip()
+    await read_body(reader, headers)
+    return status, headers.get('connection') != 'close'
+
+
+async def client(urls, deadline, timeout, stats):
+    connection = None
+    for url in cycle(urls):
+        if time.monotonic() >= deadline:
+            break
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(
+                    asyncio.open_connection(url.hostname, url.port or 80),
+                    timeout,
+                )
+            status, keep_alive = await asyncio.wait_for(
+                fetch(*connection, url.netloc, url.path or '/'), timeout
+            )
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError):
+            stats['errors'] += 1
+            keep_alive = False
+        else:
+            stats['timings'].append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                stats['errors'] += 1
+        if not keep_alive and connection is not None:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def run(args):
+    urls = [urlsplit(url) for url in args.url]
+    stats = {'timings': [], 'errors': 0}
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        client(urls, deadline, args.timeout, stats)
+        for _ in range(args.connections)
+    ))
+    return stats, time.monotonic() - started
+
+
+def main():
+    args = parse_args()
+    stats, elapsed = asyncio.run(run(args))
+    timings = sorted(stats['timings'])
+    if not timings:
+        print(f'Ни одного ответа, ошибок: {stats["errors"]}.')
+        return
+    print(
+        f'{args.connections} соединений, {len(timings)} ответов: '
+        f'{len(timings) / elapsed:.0f} запросов/с, '
+        f'p50 {percentile(timings, 0.5):.1f} мс, '
+        f'p95 {percentile(timings, 0.95):.1f} мс, '
+        f'p99 {percentile(timings, 0.99):.1f} мс, '
+        f'ошибок: {stats["errors"]}'
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Общие части скриптов замеров.
+
+Скрипты запускаются напрямую (python benchmarks/<скрипт>.py) и работают с
+отдельной базой: по умолчанию временным файлом SQLite, другую базу можно
+указать в DATABASE_URL.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    if 'DATABASE_URL' not in os.environ:
+        path = Path(tempfile.mkdtemp()) / 'benchmark.sqlite3'
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    # Все запросы замеров приходят с одного адреса.
+    os.environ.setdefault('THROTTLING_ENABLED', '0')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index]
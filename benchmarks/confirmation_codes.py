@@ -0,0 +1,118 @@
+"""Замер повторных запросов кода подтверждения.
+
+Скрипт создаёт пользователей и отправляет для них POST /api/v1/auth/signup/
+в двух режимах:
+
+- hmac - текущая схема: код вычисляется из состояния пользователя, в базу
+  пишется только письмо в очередь исходящей почты;
+- stored - прежняя схема: дополнительно в строку пользователя записывается
+  случайный код из 16 символов (эмулируется обновлением поля той же
+  длины).
+
+Для каждого режима печатаются запросы в секунду и p50/p95/p99 задержки, а
+также время создания и проверки одного кода.
+
+    python benchmarks/confirmation_codes.py --users 2000
+"""
+import argparse
+import time
+from unittest import mock
+
+from common import percentile, setup_django
+
+STORED_CODE_LENGTH = 16
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=2000)
+    return parser.parse_args()
+
+
+def seed(count):
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    User.objects.bulk_create(
+        User(username=f'user{index}', email=f'user{index}@yamdb.fake')
+        for index in range(count)
+    )
+    return list(User.objects.values_list('username', 'email'))
+
+
+def stored_code(send_confirmation_code):
+    from django.contrib.auth import get_user_model
+    from django.utils.crypto import get_random_string
+
+    User = get_user_model()
+
+    def send_with_stored_code(user):
+        User.objects.filter(pk=user.pk).update(
+            first_name=get_random_string(STORED_CODE_LENGTH)
+        )
+        send_confirmation_code(user)
+
+    return send_with_stored_code
+
+
+def run_signups(users):
+    from django.test import Client
+
+    client = Client()
+    timings = []
+    started = time.perf_counter()
+    for username, email in users:
+        request_started = time.perf_counter()
+        response = client.post(
+            '/api/v1/auth/signup/', {'username': username, 'email': email}
+        )
+        timings.append((time.perf_counter() - request_started) * 1000)
+        assert response.status_code == 200, response.content
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return len(users) / elapsed, timings
+
+
+def measure_codes(users, repeat=1000):
+    from django.contrib.auth import get_user_model
+
+    from users.tokens import confirmation_code_generator
+
+    user = get_user_model().objects.get(username=users[0][0])
+    started = time.perf_counter()
+    for _ in range(repeat):
+        code = confirmation_code_generator.make_token(user)
+    made = (time.perf_counter() - started) / repeat * 1e6
+    started = time.perf_counter()
+    for _ in range(repeat):
+        confirmation_code_generator.check_token(user, code)
+    checked = (time.perf_counter() - started) / repeat * 1e6
+    return made, checked
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    import api.views
+
+    users = seed(args.users)
+    run_signups(users[:50])
+    modes = (
+        ('hmac', api.views.send_confirmation_code),
+        ('stored', stored_code(api.views.send_confirmation_code)),
+    )
+    for name, send in modes:
+        with mock.patch.object(api.views, 'send_confirmation_code', send):
+            rps, timings = run_signups(users)
+        print(
+            f'{name}: {rps:.0f} запросов/с, '
+            f'p50 {percentile(timings, 0.5):.2f} мс, '
+            f'p95 {percentile(timings, 0.95):.2f} мс, '
+            f'p99 {percentile(timings, 0.99):.2f} мс'
+        )
+    made, checked = measure_codes(users)
+    print(f'Создание кода: {made:.1f} мкс, проверка: {checked:.1f} мкс.')
+
+
+if __name__ == '__main__':
+    main()
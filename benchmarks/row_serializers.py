@@ -0,0 +1,134 @@
+"""Замер сериализации списков: сериализаторы DRF против строк values().
+
+Для произведений, отзывов и комментариев скрипт выбирает --objects объектов
+так же, как это делают списки API, и сериализует их двумя способами:
+обычным сериализатором по объектам моделей и RowSerializer по строкам
+values() (api/row_serializers.py). Печатается медиана времени на 1000
+объектов отдельно для выборки с сериализацией и для одной сериализации.
+
+    python benchmarks/row_serializers.py --objects 1000
+"""
+import argparse
+import statistics
+import time
+
+from common import setup_django
+
+GENRES = 20
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--objects', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    return parser.parse_args()
+
+
+def seed(count):
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import (
+        Category, Comment, Genre, GenreTitle, Review, Title
+    )
+
+    User = get_user_model()
+    category = Category.objects.create(name='Фильм', slug='movie')
+    # SQLite не возвращает id из bulk_create, поэтому объекты
+    # перечитываются.
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(GENRES)
+    )
+    genres = list(Genre.objects.order_by('pk'))
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {index}', year=2000, category=category,
+            description='Описание произведения', rating=7,
+        )
+        for index in range(count)
+    )
+    titles = list(Title.objects.order_by('pk'))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title=title, genre=genres[(index + shift) % GENRES])
+        for index, title in enumerate(titles) for shift in range(2)
+    )
+    User.objects.bulk_create(
+        User(username=f'user{index}', email=f'user{index}@yamdb.fake')
+        for index in range(count)
+    )
+    users = list(User.objects.order_by('pk'))
+    Review.objects.bulk_create(
+        Review(title=titles[0], author=user, text='Текст отзыва', score=8)
+        for user in users
+    )
+    review = Review.objects.order_by('pk').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=user, text='Текст комментария')
+        for user in users
+    )
+    return titles[0], review
+
+
+def querysets(title, review):
+    from api.serializers import (
+        CommentSerializer, ReviewSerializer, TitleReadSerializer
+    )
+    from api.views import TitleViewSet
+
+    return {
+        'titles': (TitleViewSet.queryset.all(), TitleReadSerializer),
+        'reviews': (
+            title.reviews.select_related('author'), ReviewSerializer
+        ),
+        'comments': (
+            review.comments.select_related('author'), CommentSerializer
+        ),
+    }
+
+
+def measure(func, repeat, objects):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000 * 1000 / objects
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from api.row_serializers import row_serializer
+
+    title, review = seed(args.objects)
+    print(
+        f'{"список":10}{"":>12}{"DRF, мс":>10}{"строки, мс":>12}'
+        f'{"ускорение":>11}'
+    )
+    for name, (queryset, serializer_class) in querysets(
+        title, review
+    ).items():
+        rows = row_serializer(serializer_class)
+        objects = list(queryset)
+        values = list(rows.rows(queryset))
+        results = {
+            'выборка': (
+                lambda: serializer_class(list(queryset.all()), many=True).data,
+                lambda: rows.serialize(list(rows.rows(queryset.all()))),
+            ),
+            'сериализ.': (
+                lambda: serializer_class(objects, many=True).data,
+                lambda: rows.serialize(values),
+            ),
+        }
+        for stage, (regular, fast) in results.items():
+            before = measure(regular, args.repeat, args.objects)
+            after = measure(fast, args.repeat, args.objects)
+            print(
+                f'{name:10}{stage:>12}{before:10.1f}{after:12.1f}'
+                f'{before / after:10.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main()
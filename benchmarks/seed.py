@@ -0,0 +1,47 @@
+"""Наполнение базы замеров синтетическими данными.
+
+Данные создаёт команда generate_dataset: число отзывов на произведение и
+активность авторов распределены неравномерно, как в реальном каталоге.
+Содержимое зависит только от seed, поэтому замеры разных коммитов идут на
+одинаковых данных.
+"""
+import io
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Dataset:
+    usernames: list = field(default_factory=list)
+    title_ids: list = field(default_factory=list)
+    reviews: list = field(default_factory=list)
+    comments: list = field(default_factory=list)
+
+
+def seed_dataset(users, titles, reviews, comments, seed=0):
+    """Создаёт данные и возвращает их идентификаторы для запросов."""
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    from reviews.models import Comment, Review, Title
+
+    call_command(
+        'generate_dataset',
+        users=users,
+        titles=titles,
+        reviews_per_title=reviews / titles,
+        comments_per_review=comments / max(reviews, 1),
+        seed=seed,
+        stdout=io.StringIO(),
+    )
+    return Dataset(
+        usernames=list(
+            get_user_model().objects.values_list('username', flat=True)
+        ),
+        title_ids=list(Title.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )),
+        reviews=list(Review.objects.values_list('title_id', 'pk')),
+        comments=list(Comment.objects.values_list(
+            'review__title_id', 'review_id', 'pk'
+        )),
+    )
@@ -0,0 +1,139 @@
+"""Замер времени фильтров списка произведений на большой базе.
+
+Скрипт создаёт отдельную базу (по умолчанию временный файл SQLite; другую
+базу можно указать в DATABASE_URL), заполняет её случайными произведениями
+и для каждого фильтра /api/v1/titles/ замеряет запросы, которые выполняет
+эндпоинт: подсчёт числа объектов и выборку первой страницы. Вместе со
+временем печатается план запроса, чтобы было видно, какой индекс
+используется. С --drop-indexes индексы фильтров удаляются перед замером,
+что позволяет сравнить результаты.
+
+    python benchmarks/title_filters.py --titles 1000000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from common import percentile, setup_django
+
+FILTER_INDEXES = (
+    'title_category_year_idx',
+    'genre_title_genre_idx',
+    'title_name_search_idx',
+)
+WORDS = (
+    'звезда', 'ночь', 'город', 'море', 'война', 'мир', 'песня', 'дорога',
+    'ветер', 'тень', 'огонь', 'река', 'star', 'night', 'city', 'river',
+)
+CATEGORIES = 20
+GENRES = 40
+GENRES_PER_TITLE = 2
+BATCH_SIZE = 10000
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument(
+        '--drop-indexes', action='store_true',
+        help='Удалить индексы фильтров перед замером.'
+    )
+    return parser.parse_args()
+
+
+def seed(count, rng):
+    from django.db import transaction
+
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(CATEGORIES)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(GENRES)
+    )
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        with transaction.atomic():
+            Title.objects.bulk_create(
+                Title(
+                    id=start + index + 1,
+                    name=' '.join(rng.choices(WORDS, k=3)).capitalize(),
+                    year=rng.randint(1900, 2024),
+                    category_id=rng.choice(category_ids),
+                )
+                for index in range(size)
+            )
+            GenreTitle.objects.bulk_create(
+                GenreTitle(title_id=start + index + 1, genre_id=genre_id)
+                for index in range(size)
+                for genre_id in rng.sample(genre_ids, GENRES_PER_TITLE)
+            )
+
+
+def drop_indexes():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        for index in FILTER_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {index}')
+
+
+def measure(params, repeat, page_size):
+    from api.filters import TitleFilter
+    from reviews.models import Title
+
+    queryset = TitleFilter(params, queryset=Title.objects.all()).qs
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        queryset.count()
+        list(queryset[:page_size])
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return (
+        statistics.median(timings),
+        percentile(timings, 0.95),
+        queryset[:page_size].explain(),
+    )
+
+
+def main():
+    args = parse_args()
+    setup_django()
+    from django.conf import settings
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    seed(args.titles, rng)
+    print(
+        f'Создано {args.titles} произведений за '
+        f'{time.perf_counter() - started:.1f} с.'
+    )
+    if args.drop_indexes:
+        drop_indexes()
+    cases = (
+        {'category': 'category-3'},
+        {'category': 'category-3', 'year': '1999'},
+        {'genre': 'genre-7'},
+        {'genre': 'genre-7', 'year': '1999'},
+        {'name': 'звезда'},
+        {'name_prefix': 'Звезда ночь'},
+    )
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    for params in cases:
+        p50, p95, plan = measure(params, args.repeat, page_size)
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        print(f'\n?{query}: p50 {p50:.1f} мс, p95 {p95:.1f} мс')
+        print(plan)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import caches
+
+
+def clear_caches():
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Идентификаторы объектов повторяются между тестами, поэтому кеши
+    # не должны переживать тест.
+    clear_caches()
+    yield
+    clear_caches()
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_throttling(settings):
+    # Тесты отправляют много запросов подряд; ограничения проверяет
+    # test_20_throttling, включая их явно.
+    settings.THROTTLING_ENABLED = False
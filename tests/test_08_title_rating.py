@@ -0,0 +1,222 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+def statement(sql):
+    """Команда SQL и таблица, с которой она работает."""
+    table = re.search(r'(?:FROM|INTO|UPDATE) "(\w+)"', sql)
+    return (sql.split()[0], table[1]) if table else (sql.split()[0],)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              admin, user_client, user,
+                                              moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_title(client, title_id)['rating'] == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 8}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_title(client, title_id)['rating'] == 6, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки отзыва.'
+        )
+
+        for review in reviews:
+            response = admin_client.delete(
+                self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                    title_id=title_id, review_id=review['id']
+                )
+            )
+            assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_title(client, title_id)['rating'] is None, (
+            'Проверьте, что после удаления всех отзывов рейтинг '
+            'произведения равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, client, admin_client,
+                                            admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        from reviews.models import Title
+
+        Title.objects.update(rating=1, reviews_count=0, score_sum=0)
+        # Список с неверной статистикой попадает в кеш.
+        client.get('/api/v1/titles/')
+        call_command('recalculate_ratings', batch_size=1)
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            5, 2, 10
+        ), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'статистику отзывов произведения.'
+        )
+        assert self.get_title(client, titles[1]['id'])['rating'] is None
+        ratings = {
+            title['id']: title['rating']
+            for title in client.get('/api/v1/titles/').json()['results']
+        }
+        assert ratings[titles[0]['id']] == 5, (
+            'Проверьте, что команда `recalculate_ratings` сбрасывает кеш '
+            'списка произведений.'
+        )
+
+    def test_03_review_post_statements(self, admin_client, user_client,
+                                       moderator_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        # Пользователь попадает в кеш аутентификации.
+        assert user_client.get(url).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, {'text': 'Да', 'score': 6})
+        assert response.status_code == HTTPStatus.CREATED
+        statements = [statement(query['sql']) for query in queries]
+        assert statements == [
+            ('BEGIN',),
+            ('UPDATE', 'reviews_title'),
+            ('INSERT', 'reviews_review'),
+            ('INSERT', 'search_searchdocument'),
+        ], (
+            'Проверьте, что отзыв и его поисковый документ создаются '
+            'вставками, а статистика произведения - одним UPDATE без '
+            'предварительных SELECT.'
+        )
+        response = moderator_client.post(url, {'text': 'Нет', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = user_client.post(url, {'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что второй отзыв автора на произведение отклоняется '
+            'со статусом 400.'
+        )
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            7, 2, 13
+        ), (
+            'Проверьте, что отклонённый отзыв не меняет статистику, а '
+            'рейтинг округляется половиной вверх.'
+        )
+        response = admin_client.post(
+            '/api/v1/titles/100500/reviews/', {'text': 'Да', 'score': 6}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_author_deletion_updates_stats(self, admin_client, user,
+                                              user_client, moderator_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        for client, score in ((user_client, 3), (moderator_client, 8)):
+            response = client.post(url, data={'text': 'Отзыв', 'score': score})
+            assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            8, 1, 8
+        ), (
+            'Проверьте, что отзывы, удалённые вместе с автором, вычитаются '
+            'из статистики произведения.'
+        )
+        response = admin_client.get(f'{url}?cursor=&count=approximate')
+        assert response.json()['count'] == 1
+
+        response = admin_client.delete(f'/api/v1/titles/{title.pk}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что произведение с отзывами удаляется.'
+        )
+
+    def test_05_half_up_migration(self):
+        from importlib import import_module
+
+        from django.apps import apps
+        from django.db import connection
+
+        from reviews.models import Title
+
+        migration = import_module('reviews.migrations.0008_half_up_rating')
+        stats = ((13, 2, 6), (15, 2, 7), (17, 3, 6), (0, 0, None))
+        titles = [
+            Title.objects.create(
+                name=f'Произведение {score_sum}', year=2000,
+                score_sum=score_sum, reviews_count=reviews_count,
+                rating=rating,
+            )
+            for score_sum, reviews_count, rating in stats
+        ]
+        with connection.schema_editor() as schema_editor:
+            migration.recalculate_ratings(apps, schema_editor)
+        assert [
+            Title.objects.get(pk=title.pk).rating for title in titles
+        ] == [7, 8, 6, None], (
+            'Проверьте, что миграция пересчитывает сохранённый рейтинг с '
+            'округлением половины вверх.'
+        )
+        assert Title.objects.get(pk=titles[2].pk).updated_at == (
+            titles[2].updated_at
+        ), 'Проверьте, что миграция не трогает верные рейтинги.'
+
+    def test_06_text_edit_keeps_title(self, client, user_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 6})
+        assert response.status_code == HTTPStatus.CREATED
+        review_url = f'{url}{response.json()["id"]}/'
+        title.refresh_from_db()
+        detail = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.pk)
+        etag = client.get(detail)['ETag']
+
+        response = user_client.patch(review_url, {'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert Title.objects.get(pk=title.pk).updated_at == (
+            title.updated_at
+        ), (
+            'Проверьте, что правка только текста отзыва не меняет '
+            'произведение.'
+        )
+        assert client.get(detail)['ETag'] == etag, (
+            'Проверьте, что правка только текста отзыва не меняет ETag '
+            'произведения.'
+        )
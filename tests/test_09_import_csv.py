@@ -0,0 +1,114 @@
+import csv
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+
+
+def count_rows(filename):
+    with open(DATA_DIR / filename, encoding='utf-8', newline='') as csv_file:
+        return sum(1 for _ in csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09ImportCSV:
+
+    def test_01_import_all_files(self, django_user_model):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        call_command('import_csv', batch_size=7)
+
+        for filename, model in (
+                ('users.csv', django_user_model),
+                ('titles.csv', Title),
+                ('genre_title.csv', GenreTitle),
+                ('review.csv', Review),
+                ('comments.csv', Comment),
+        ):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{filename}`.'
+            )
+
+        title = Title.objects.get(pk=1)
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после загрузки отзывов команда `import_csv` '
+            'пересчитывает статистику произведений.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `import_csv` сохраняет дату публикации '
+            'отзыва из файла.'
+        )
+
+    def test_02_dry_run_writes_nothing(self):
+        from reviews.models import Review
+
+        call_command('import_csv', only=['review.csv'], dry_run=True)
+        assert not Review.objects.exists(), (
+            'Проверьте, что команда `import_csv --dry-run` не записывает '
+            'данные в базу.'
+        )
+
+    def test_03_checkpoint_resume(self, tmp_path):
+        from reviews.models import Review
+
+        call_command(
+            'import_csv',
+            only=['users.csv', 'category.csv', 'titles.csv'],
+        )
+        call_command('import_csv', only=['review.csv'], checkpoint=tmp_path)
+        reviews_count = Review.objects.count()
+        assert reviews_count == count_rows('review.csv')
+
+        Review.objects.all().delete()
+        call_command('import_csv', only=['review.csv'], checkpoint=tmp_path)
+        assert not Review.objects.exists(), (
+            'Проверьте, что при повторном запуске `import_csv` с той же '
+            'контрольной точкой загруженные диапазоны пропускаются.'
+        )
+
+    def test_04_resume_reports_skipped_rows(self, tmp_path):
+        from io import StringIO
+
+        from reviews.models import Review
+
+        call_command(
+            'import_csv',
+            only=['users.csv', 'category.csv', 'titles.csv'],
+        )
+        call_command('import_csv', only=['review.csv'], checkpoint=tmp_path)
+        # Сбой после фиксации диапазона, но до записи контрольной точки.
+        checkpoint = tmp_path / 'review.csv.checkpoint'
+        source = checkpoint.read_text(encoding='utf-8').splitlines()[0]
+        checkpoint.write_text(source + '\n', encoding='utf-8')
+        deleted = Review.objects.filter(pk__gt=10).count()
+        Review.objects.filter(pk__gt=10).delete()
+        output = StringIO()
+        call_command(
+            'import_csv', only=['review.csv'], checkpoint=tmp_path,
+            stdout=output,
+        )
+        assert Review.objects.count() == count_rows('review.csv')
+        assert f': {deleted} строк за' in output.getvalue(), (
+            'Проверьте, что `import_csv` выводит число вставленных строк.'
+        )
+        assert f'пропущено {count_rows("review.csv") - deleted} строк' in (
+            output.getvalue()
+        ), 'Проверьте, что `import_csv` выводит число пропущенных строк.'
+
+    def test_05_conflict_without_resume(self, tmp_path):
+        from django.core.management.base import CommandError
+
+        call_command(
+            'import_csv',
+            only=['users.csv', 'category.csv', 'titles.csv'],
+        )
+        call_command('import_csv', only=['review.csv'], checkpoint=tmp_path)
+        with pytest.raises(CommandError):
+            call_command(
+                'import_csv', only=['review.csv'],
+                checkpoint=tmp_path / 'other',
+            )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CatalogueCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_cached_until_changed(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        from reviews.models import Title
+
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        Title.objects.update(name='Изменено в обход API')
+        response = client.get(self.TITLES_URL)
+        assert 'Изменено в обход API' not in {
+            title['name'] for title in response.json()['results']
+        }, (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'кешируется.'
+        )
+
+        response = admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'year': 2000}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(self.TITLES_URL)
+        assert {
+            title['name'] for title in response.json()['results']
+        } == {'Изменено в обход API'}, (
+            'Проверьте, что изменение произведения сбрасывает кеш списка '
+            'произведений.'
+        )
+
+    def test_02_query_string_is_normalized(self, client, admin_client):
+        create_titles(admin_client)
+        first = client.get(f'{self.TITLES_URL}?year=1984&genre=horror')
+        second = client.get(f'{self.TITLES_URL}?genre=horror&year=1984')
+        assert first.json() == second.json()
+        assert len(first.json()['results']) == 1
+
+    def test_03_review_changes_rating(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        assert client.get(url).json()['rating'] is None
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        assert client.get(url).json()['rating'] == 9, (
+            'Проверьте, что новый отзыв сбрасывает закешированный рейтинг '
+            'произведения.'
+        )
+
+    def test_04_genre_delete(self, client, admin_client):
+        create_titles(admin_client)
+        assert client.get(self.GENRES_URL).json()['count'] == 3
+        admin_client.delete(f'{self.GENRES_URL}horror/')
+        assert client.get(self.GENRES_URL).json()['count'] == 2
+        response = client.get(f'{self.TITLES_URL}?genre=horror')
+        assert response.json()['count'] == 0
+
+    def test_05_only_json_cached(self, client, admin_client):
+        create_titles(admin_client)
+        browsable = client.get(self.TITLES_URL, HTTP_ACCEPT='text/html')
+        assert browsable.status_code == HTTPStatus.OK
+        assert browsable['Content-Type'].startswith('text/html')
+        response = client.get(self.TITLES_URL)
+        assert response['Content-Type'] == 'application/json', (
+            'Проверьте, что страница API для браузера не попадает в кеш '
+            'JSON-ответов.'
+        )
+        assert response['ETag'] != browsable['ETag']
+        response = client.get(
+            self.TITLES_URL, HTTP_ACCEPT='text/html',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag JSON-ответа не подходит к странице API для '
+            'браузера.'
+        )
+        assert response['ETag'] == browsable['ETag']
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def assert_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag and etag.startswith('"'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'строгий ETag.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        return etag
+
+    def test_01_read_endpoints(self, client, admin_client, admin, user,
+                               user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (
+                '/api/v1/categories/',
+                '/api/v1/genres/',
+                '/api/v1/titles/',
+                f'/api/v1/titles/{titles[0]["id"]}/',
+                reviews_url,
+                f'{reviews_url}{reviews[0]["id"]}/',
+                f'{reviews_url}{reviews[0]["id"]}/comments/',
+        ):
+            self.assert_not_modified(client, url)
+        self.assert_not_modified(admin_client, '/api/v1/users/')
+        self.assert_not_modified(user_client, '/api/v1/users/me/')
+
+    def test_02_etag_changes_with_content(self, client, admin_client, user,
+                                          user_client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        etag = self.assert_not_modified(client, url)
+        assert client.get(url).has_header('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `Last-Modified`.'
+        )
+
+        user_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'Новый'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется после изменения '
+            'отзыва.'
+        )
+        etag = response['ETag']
+
+        user_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag списка отзывов меняется после удаления '
+            'отзыва.'
+        )
+
+    def test_03_nested_objects_change_etag(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = self.assert_not_modified(client, url)
+        from reviews.models import Category
+
+        category = Category.objects.get(slug=titles[0]['category'])
+        category.name = 'Кино'
+        category.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['category']['name'] == 'Кино'
@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13KeysetPagination:
+
+    REVIEWS_COUNT = 25
+
+    def create_reviews(self, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'author{index}',
+                              email=f'author{index}@yamdb.fake')
+            for index in range(self.REVIEWS_COUNT)
+        )
+        authors = django_user_model.objects.filter(
+            username__startswith='author'
+        )
+        # Одинаковая дата у части отзывов проверяет порядок по id.
+        pub_date = timezone.now()
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Текст', score=5,
+                   pub_date=pub_date if index % 2 else timezone.now())
+            for index, author in enumerate(authors)
+        )
+        Title.objects.filter(pk=title.pk).update(
+            reviews_count=self.REVIEWS_COUNT
+        )
+        expected = list(
+            Review.objects.order_by('pub_date', 'id')
+            .values_list('id', flat=True)
+        )
+        return f'/api/v1/titles/{title.pk}/reviews/', expected
+
+    def walk(self, client, url, link='next'):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            ids.append([review['id'] for review in data['results']])
+            url = data[link]
+        return ids
+
+    def test_01_offset_pagination_is_default(self, client,
+                                             django_user_model):
+        url, _ = self.create_reviews(django_user_model)
+        data = client.get(url).json()
+        assert data['count'] == self.REVIEWS_COUNT
+        assert data['next'] and 'page=2' in data['next'], (
+            'Проверьте, что без параметра `cursor` отзывы разбиваются '
+            'на страницы по номеру.'
+        )
+
+    def test_02_cursor_walks_forward_and_back(self, client,
+                                              django_user_model):
+        url, expected = self.create_reviews(django_user_model)
+        pages = self.walk(client, f'{url}?cursor=')
+        assert [pk for page in pages for pk in page] == expected, (
+            'Проверьте, что при пагинации по ключу страницы идут в порядке '
+            '(pub_date, id) без пропусков и повторов.'
+        )
+        last_page = client.get(f'{url}?cursor=')
+        for _ in pages[1:]:
+            last_page = client.get(last_page.json()['next'])
+        back = self.walk(client, last_page.json()['previous'], 'previous')
+        assert back == pages[-2::-1], (
+            'Проверьте, что ссылка `previous` при пагинации по ключу '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_03_count_modes(self, client, django_user_model):
+        url, _ = self.create_reviews(django_user_model)
+        assert client.get(f'{url}?cursor=').json()['count'] is None, (
+            'Проверьте, что при пагинации по ключу количество объектов '
+            'по умолчанию не считается.'
+        )
+        for mode in ('exact', 'approximate'):
+            data = client.get(f'{url}?cursor=&count={mode}').json()
+            assert data['count'] == self.REVIEWS_COUNT
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с неверным курсором возвращает ответ '
+            'со статусом 404.'
+        )
+
+    @pytest.mark.parametrize('position', (
+        [None, 1, False], ['2022-01-01T00:00:00Z', None, False],
+        ['не дата', 1, False], [1, 2],
+    ))
+    def test_04_malformed_cursor(self, client, django_user_model, position):
+        import json
+        from base64 import urlsafe_b64encode
+
+        url, _ = self.create_reviews(django_user_model)
+        cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+        response = client.get(f'{url}?cursor={cursor}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что курсор с неверной позицией возвращает ответ '
+            'со статусом 404.'
+        )
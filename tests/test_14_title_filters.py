@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_filter_indexes(self):
+        from reviews.models import GenreTitle, Title
+
+        with connection.cursor() as cursor:
+            title_indexes = connection.introspection.get_constraints(
+                cursor, Title._meta.db_table
+            )
+            genre_title_indexes = connection.introspection.get_constraints(
+                cursor, GenreTitle._meta.db_table
+            )
+        for name, indexes in (
+                ('title_category_year_idx', title_indexes),
+                ('title_name_search_idx', title_indexes),
+                ('genre_title_genre_idx', genre_title_indexes),
+        ):
+            assert name in indexes, (
+                f'Проверьте, что миграции создают индекс `{name}`.'
+            )
+        assert genre_title_indexes['genre_title_genre_idx']['columns'] == [
+            'genre_id', 'title_id'
+        ]
+
+    def test_02_name_prefix(self, client):
+        from reviews.models import Title
+
+        Title.objects.bulk_create((
+            Title(name='Звёздные войны', year=1977),
+            Title(name='Война и мир', year=1966),
+        ))
+        response = client.get(f'{self.TITLES_URL}?name_prefix=Война')
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            title['name'] for title in response.json()['results']
+        ] == ['Война и мир'], (
+            'Проверьте, что фильтр `name_prefix` находит произведения по '
+            'началу названия.'
+        )
+        response = client.get(f'{self.TITLES_URL}?name=ойн')
+        assert response.json()['count'] == 2, (
+            'Проверьте, что фильтр `name` по-прежнему ищет подстроку.'
+        )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Search:
+
+    SEARCH_URL = '/api/v1/search/'
+
+    def found(self, client, query, **params):
+        response = client.get(self.SEARCH_URL, {'q': query, **params})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert {'count', 'next', 'previous', 'results'} <= set(data), (
+            'Проверьте, что результаты поиска разбиты на страницы.'
+        )
+        return [(result['type'], result['id']) for result in data['results']]
+
+    def test_01_titles_and_reviews(self, client, user):
+        from reviews.models import Review, Title
+
+        stars = Title.objects.create(
+            name='Звёздные войны', year=1977, description='Space opera'
+        )
+        peace = Title.objects.create(name='Война и мир', year=1966)
+        review = Review.objects.create(
+            title=peace, author=user, score=9, text='Лучшая книга о звезде.'
+        )
+        assert set(self.found(client, 'звезды')) == {
+            ('title', stars.pk), ('review', review.pk)
+        }, (
+            'Проверьте, что поиск находит произведения и отзывы по разным '
+            'формам русского слова и не различает «е» и «ё».'
+        )
+        assert self.found(client, 'SPACE') == [('title', stars.pk)], (
+            'Проверьте, что поиск ищет по описанию произведения без учёта '
+            'регистра.'
+        )
+        assert self.found(client, 'звезды', type='review') == [
+            ('review', review.pk)
+        ]
+        response = client.get(self.SEARCH_URL, {'q': 'мир', 'type': 'user'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_02_index_follows_changes(self, client, user):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Война и мир', year=1966)
+        review = Review.objects.create(
+            title=title, author=user, score=9, text='Длинная книга.'
+        )
+        title.name = 'Анна Каренина'
+        title.save()
+        assert self.found(client, 'война') == [], (
+            'Проверьте, что изменение произведения обновляет поисковый '
+            'индекс.'
+        )
+        assert self.found(client, 'Каренина') == [('title', title.pk)]
+        review.delete()
+        assert self.found(client, 'книга') == [], (
+            'Проверьте, что удалённый отзыв пропадает из поиска.'
+        )
+        title.delete()
+        assert self.found(client, 'Каренина') == []
+
+    def test_03_rebuild_after_import(self, client):
+        call_command('import_csv', only=[
+            'users.csv', 'category.csv', 'titles.csv', 'review.csv'
+        ])
+        results = self.found(client, 'побег')
+        assert ('title', 1) in results, (
+            'Проверьте, что после загрузки `import_csv` произведения '
+            'доступны в поиске.'
+        )
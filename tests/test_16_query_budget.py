@@ -0,0 +1,82 @@
+import os
+
+import pytest
+import yaml
+
+from tests.conftest import MANAGE_PATH
+
+REDOC_PATH = os.path.join(MANAGE_PATH, 'static', 'redoc.yaml')
+# Аутентификация, подсчёт объектов, выборка страницы, связанные объекты,
+# ETag и родительский объект для вложенных списков.
+QUERY_BUDGET = 6
+OBJECTS_COUNT = 15
+
+
+def list_endpoints():
+    with open(REDOC_PATH, encoding='utf-8') as redoc:
+        spec = yaml.safe_load(redoc)
+    for path, operations in spec['paths'].items():
+        if 'get' not in operations:
+            continue
+        schema = (
+            operations['get']['responses'].get(200, {})
+            .get('content', {}).get('application/json', {}).get('schema', {})
+        )
+        if 'results' in schema.get('properties', {}):
+            yield path
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    categories = [
+        Category.objects.create(name=f'Категория {index}', slug=f'c{index}')
+        for index in range(2)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {index}', slug=f'g{index}')
+        for index in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        for index in range(OBJECTS_COUNT)
+    ]
+    titles = []
+    for index in range(OBJECTS_COUNT):
+        title = Title.objects.create(
+            name=f'Произведение {index}', year=2000,
+            category=categories[index % 2],
+        )
+        title.genre.set(genres[:index % 3 + 1])
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text='Отзыв', score=5
+        )
+        for author in authors
+    ]
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий'
+        )
+    return {'title_id': titles[0].pk, 'review_id': reviews[0].pk}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryBudget:
+
+    def test_01_spec_lists_endpoints(self):
+        assert len(list(list_endpoints())) >= 6
+
+    @pytest.mark.parametrize('path', list(list_endpoints()))
+    def test_02_list_query_budget(self, path, catalogue, admin_client,
+                                  django_assert_max_num_queries):
+        url = f'/api/v1{path.format(**catalogue)}'
+        with django_assert_max_num_queries(QUERY_BUDGET):
+            response = admin_client.get(url)
+        assert len(response.json()['results']) > 1, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает список.'
+        )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def token_client(user):
+    from api.authentication import UserAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {UserAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17JWTUserCache:
+
+    def test_01_token_claims(self, client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from users.tokens import confirmation_code_generator
+
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': confirmation_code_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        token = AccessToken(response.json()['token'])
+        assert token['role'] == user.role and token['ver'] == 0, (
+            'Проверьте, что токен содержит роль пользователя и версию его '
+            'токенов.'
+        )
+
+    def test_02_user_is_cached(self, user):
+        client = token_client(user)
+        client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post('/api/v1/titles/', data={})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not [
+            query for query in queries if 'users_user' in query['sql']
+        ], (
+            'Проверьте, что аутентификация по токену берёт пользователя из '
+            'кеша, а не из базы.'
+        )
+
+    def test_03_role_change_and_delete_revoke_tokens(self, admin_client,
+                                                     user):
+        client = token_client(user)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что после смены роли выданные ранее токены '
+            'пользователя не принимаются.'
+        )
+
+        user.refresh_from_db()
+        client = token_client(user)
+        assert client.get('/api/v1/users/me/').json()['role'] == 'moderator'
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токены удалённого пользователя не принимаются.'
+        )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Сервер недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Outbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @pytest.fixture(autouse=True)
+    def queued_outbox(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'valid@yamdb.fake', 'username': 'valid_username'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues_message(self, client):
+        from outbox.models import OutboxMessage
+
+        self.signup(client)
+        assert not mail.outbox, (
+            f'Проверьте, что запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо сам, а ставит его в очередь.'
+        )
+        message = OutboxMessage.objects.get()
+        assert message.recipient == 'valid@yamdb.fake'
+
+        call_command('send_outbox', batch_size=10)
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда `send_outbox` отправляет письма из '
+            'очереди.'
+        )
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.SENT
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_retries_with_backoff(self, client, settings):
+        from outbox.models import OutboxMessage
+
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        self.signup(client)
+        call_command('send_outbox')
+        message = OutboxMessage.objects.get()
+        assert message.status == OutboxMessage.PENDING
+        assert message.attempts == 1
+        assert message.next_attempt_at > timezone.now(), (
+            'Проверьте, что неудачная отправка откладывается.'
+        )
+        assert 'Сервер недоступен' in message.last_error
+
+        OutboxMessage.objects.update(next_attempt_at=timezone.now())
+        call_command('send_outbox')
+        message.refresh_from_db()
+        assert message.status == OutboxMessage.FAILED, (
+            'Проверьте, что после EMAIL_OUTBOX_MAX_ATTEMPTS неудачных '
+            'попыток письмо помечается как неотправленное.'
+        )
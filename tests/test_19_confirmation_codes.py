@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19ConfirmationCodes:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    SIGNUP_DATA = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+
+    def last_code(self):
+        return mail.outbox[-1].body.rsplit(' ', 1)[-1]
+
+    def get_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.SIGNUP_DATA['username'],
+            'confirmation_code': code,
+        })
+
+    def test_01_signup_retry_does_not_write_user(self, client):
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert not [
+            query for query in queries
+            if 'users_user' in query['sql']
+            and not query['sql'].startswith('SELECT')
+        ], (
+            f'Проверьте, что повторный запрос к `{self.URL_SIGNUP}` не '
+            'изменяет строку пользователя.'
+        )
+
+    def test_02_code_works_once(self, client):
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        first_code = self.last_code()
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        code = self.last_code()
+
+        response = self.get_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+        for used_code in (code, first_code):
+            response = self.get_token(client, used_code)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что после получения токена выданные ранее коды '
+                'подтверждения не принимаются.'
+            )
+
+    def test_03_code_expires(self, client, settings, monkeypatch):
+        from users.tokens import ConfirmationCodeGenerator
+
+        client.post(self.URL_SIGNUP, data=self.SIGNUP_DATA)
+        expired = datetime.now() + timedelta(
+            seconds=settings.CONFIRMATION_CODE_TIMEOUT + 1
+        )
+        monkeypatch.setattr(ConfirmationCodeGenerator, '_now',
+                            lambda self: expired)
+        response = self.get_token(client, self.last_code())
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что код подтверждения перестаёт действовать через '
+            '`CONFIRMATION_CODE_TIMEOUT` секунд.'
+        )
@@ -0,0 +1,118 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20Throttling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_REVIEWS = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def throttling(self, settings):
+        settings.THROTTLING_ENABLED = True
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'signup_ip': '5/minute',
+                'signup_username': '2/minute',
+                'write_user': '2/minute',
+            },
+        }
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        import api.throttling
+
+        # Начало минутного окна.
+        now = [60.0 * 16_667]
+        monkeypatch.setattr(api.throttling.time, 'time', lambda: now[0])
+        return now
+
+    def signup(self, client, username):
+        return client.post(self.URL_SIGNUP, data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+
+    def assert_throttled(self, response, url):
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что при превышении лимита запрос к `{url}` '
+            'возвращает ответ со статусом 429.'
+        )
+        assert int(response['Retry-After']) >= 1, (
+            'Проверьте, что ответ со статусом 429 содержит заголовок '
+            '`Retry-After`.'
+        )
+
+    def test_01_signup_per_username(self, client, clock):
+        for _ in range(2):
+            assert self.signup(client, 'valid').status_code == HTTPStatus.OK
+        response = self.signup(client, 'VALID')
+        self.assert_throttled(response, self.URL_SIGNUP)
+        assert int(response['Retry-After']) == 60
+        assert self.signup(client, 'other').status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по имени пользователя не затрагивает '
+            'других пользователей.'
+        )
+
+    def test_02_signup_per_ip(self, client, clock):
+        for index in range(5):
+            response = self.signup(client, f'user{index}')
+            assert response.status_code == HTTPStatus.OK
+        self.assert_throttled(self.signup(client, 'user5'), self.URL_SIGNUP)
+        response = self.signup(client, 'user5')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что отклонённые запросы не сбрасывают лимит.'
+        )
+
+    def test_03_sliding_window(self, client, clock):
+        for _ in range(2):
+            self.signup(client, 'valid')
+        clock[0] += 60
+        response = self.signup(client, 'valid')
+        self.assert_throttled(response, self.URL_SIGNUP)
+        assert int(response['Retry-After']) == 30
+        clock[0] += 30
+        response = self.signup(client, 'valid')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит восстанавливается по мере того, как '
+            'прошлые запросы выходят из скользящего окна.'
+        )
+
+    def test_04_reviews_per_user(self, admin_client, user_client, clock):
+        titles, _, _ = create_titles(admin_client)
+        for title in titles[:2]:
+            url = self.URL_REVIEWS.format(title_id=title['id'])
+            response = user_client.post(url, data={'text': 'Тест', 'score': 5})
+            assert response.status_code == HTTPStatus.CREATED
+        url = self.URL_REVIEWS.format(title_id=titles[1]['id'])
+        assert user_client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит на запись не ограничивает чтение.'
+        )
+        self.assert_throttled(
+            user_client.post(url, data={'text': 'Тест', 'score': 5}), url
+        )
+        response = admin_client.post(url, data={'text': 'Тест', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что лимит на запись отзывов считается для каждого '
+            'пользователя отдельно.'
+        )
+
+    def test_05_disabled(self, client, settings):
+        settings.THROTTLING_ENABLED = False
+        for _ in range(3):
+            assert self.signup(client, 'valid').status_code == HTTPStatus.OK
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/auth/signup/', '/api/v1/auth/token/'
+    ))
+    @pytest.mark.parametrize('data', ([1, 2], 'username', 7))
+    def test_06_body_not_object(self, client, url, data):
+        response = client.post(url, data, content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{url}` отвечает 400, если тело запроса не '
+            'объект JSON.'
+        )
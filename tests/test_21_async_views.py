@@ -0,0 +1,101 @@
+import asyncio
+import importlib
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve
+
+from tests.utils import create_reviews, create_titles
+
+
+def reload_urls():
+    import api.urls
+    import api_yamdb.urls
+
+    importlib.reload(api.urls)
+    importlib.reload(api_yamdb.urls)
+    clear_url_caches()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AsyncViews:
+
+    URL_TITLES = '/api/v1/titles/'
+    URL_REVIEWS = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def async_views(self, settings):
+        settings.ASYNC_VIEWS = True
+        reload_urls()
+        yield
+        settings.ASYNC_VIEWS = False
+        reload_urls()
+
+    # В Django 3.2 AsyncClient принимает заголовки по их именам в HTTP,
+    # а не в виде ключей META.
+    def get(self, url, **headers):
+        return async_to_sync(AsyncClient().get)(url, **headers)
+
+    def test_01_list_views_are_async(self):
+        for url in (self.URL_TITLES, self.URL_REVIEWS.format(title_id=1)):
+            assert asyncio.iscoroutinefunction(resolve(url).func), (
+                f'Проверьте, что при ASYNC_VIEWS список `{url}` '
+                'обслуживается асинхронным представлением.'
+            )
+        assert not asyncio.iscoroutinefunction(
+            resolve(f'{self.URL_TITLES}1/').func
+        )
+
+    def test_02_titles_from_cache(
+        self, client, admin_client, monkeypatch
+    ):
+        from api.views import TitleViewSet
+
+        create_titles(admin_client)
+        response = self.get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == client.get(self.URL_TITLES).json(), (
+            'Проверьте, что асинхронное представление возвращает те же '
+            'данные, что и синхронное.'
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Ответ должен браться из кеша.')
+
+        monkeypatch.setattr(TitleViewSet, 'list', fail)
+        cached = self.get(self.URL_TITLES)
+        assert cached.status_code == HTTPStatus.OK
+        assert cached.json() == response.json(), (
+            'Проверьте, что закешированный ответ каталога отдаётся без '
+            'вызова представления.'
+        )
+        assert cached['ETag'] == response['ETag']
+        not_modified = self.get(
+            self.URL_TITLES, **{'if-none-match': response['ETag']}
+        )
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_03_reviews_and_writes(self, admin_client, admin, token_user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.URL_REVIEWS.format(title_id=titles[0]['id'])
+        response = self.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert [review['id'] for review in response.json()['results']] == [
+            review['id'] for review in reviews
+        ]
+        response = async_to_sync(AsyncClient().post)(
+            url,
+            data={'text': 'Отзыв', 'score': 7},
+            content_type='application/json',
+            authorization=f'Bearer {token_user["access"]}',
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что асинхронное представление списка принимает '
+            'POST-запросы.'
+        )
+        assert self.get(url).json()['count'] == len(reviews) + 1
+        response = self.get(url, accept='text/html')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/html')
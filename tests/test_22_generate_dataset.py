@@ -0,0 +1,77 @@
+import csv
+from collections import Counter
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+DATA_DIR = settings.BASE_DIR / 'static' / 'data'
+OPTIONS = {
+    'titles': 60, 'reviews_per_title': 5, 'users': 40,
+    'comments_per_review': 1, 'categories': 4, 'genres': 8,
+}
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        reader = csv.DictReader(csv_file)
+        return reader.fieldnames, list(reader)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22GenerateDataset:
+
+    def test_01_csv_output(self, tmp_path, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        call_command('generate_dataset', output=tmp_path, **OPTIONS)
+        for path in DATA_DIR.glob('*.csv'):
+            header, _ = read_csv(path)
+            assert read_csv(tmp_path / path.name)[0] == header, (
+                f'Проверьте, что `generate_dataset` пишет `{path.name}` '
+                'в схеме static/data.'
+            )
+        _, reviews = read_csv(tmp_path / 'review.csv')
+        per_title = Counter(row['title_id'] for row in reviews)
+        assert max(per_title.values()) > 3 * len(reviews) / OPTIONS['titles'], (
+            'Проверьте, что число отзывов на произведение распределено '
+            'неравномерно.'
+        )
+        assert len({(row['author'], row['title_id']) for row in reviews}) == (
+            len(reviews)
+        ), 'Автор не может оставить два отзыва на одно произведение.'
+
+        call_command('import_csv', path=tmp_path)
+        assert Title.objects.count() == OPTIONS['titles']
+        assert Review.objects.count() == len(reviews)
+        assert Comment.objects.exists()
+        title = Title.objects.get(pk=int(per_title.most_common(1)[0][0]))
+        assert title.reviews_count == per_title[str(title.pk)]
+
+    def test_02_same_seed_same_data(self, tmp_path):
+        call_command('generate_dataset', output=tmp_path / 'a', **OPTIONS)
+        call_command('generate_dataset', output=tmp_path / 'b', **OPTIONS)
+        for name in ('titles.csv', 'genre_title.csv', 'comments.csv'):
+            assert (tmp_path / 'a' / name).read_text(encoding='utf-8') == (
+                tmp_path / 'b' / name
+            ).read_text(encoding='utf-8')
+
+    def test_03_bulk_insert_appends(self, django_user_model):
+        from reviews.models import Review, Title
+
+        call_command('import_csv')
+        titles = Title.objects.count()
+        reviews = Review.objects.count()
+        call_command('generate_dataset', **OPTIONS)
+        assert Title.objects.count() == titles + OPTIONS['titles'], (
+            'Проверьте, что `generate_dataset` без `--output` добавляет '
+            'данные к уже имеющимся.'
+        )
+        assert Review.objects.count() > reviews
+        title = Title.objects.order_by('-reviews_count').first()
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после вставки пересчитывается статистика '
+            'произведений.'
+        )
+        # Счётчики первичных ключей сдвинуты за вставленные id.
+        Title.objects.create(name='Новое', year=2000)
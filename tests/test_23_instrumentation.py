@@ -0,0 +1,114 @@
+import json
+import logging
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.fixture
+def log_records(caplog):
+    logger = logging.getLogger('api.instrumentation')
+    logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger='api.instrumentation')
+    yield lambda: [json.loads(record.getMessage()) for record in caplog.records
+                   if record.name == 'api.instrumentation']
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Instrumentation:
+
+    URL_TITLES = '/api/v1/titles/'
+
+    def test_01_disabled_by_default(self, client, log_records):
+        response = client.get(self.URL_TITLES)
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('Server-Timing'), (
+            'Проверьте, что без REQUEST_INSTRUMENTATION_SAMPLE_RATE замеры '
+            'запросов не выполняются.'
+        )
+        assert not log_records()
+
+    def test_02_server_timing_and_log(
+        self, admin_client, settings, log_records
+    ):
+        create_titles(admin_client)
+        settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 1
+        client = APIClient()
+        response = client.get(self.URL_TITLES)
+        header = response['Server-Timing']
+        assert header.startswith('total;dur='), (
+            'Проверьте, что ответ содержит заголовок `Server-Timing` с '
+            'общим временем запроса.'
+        )
+        assert 'db;dur=' in header and 'cache;desc=' in header
+        record = log_records()[-1]
+        assert record['route'] == 'titles-list'
+        assert record['status'] == HTTPStatus.OK
+        assert record['queries'] >= 1 and record['duplicated'] == 0
+        assert record['cache_misses'] == 1 and record['cache_hits'] == 0
+        assert record['bytes'] == len(response.content)
+
+        client.get(self.URL_TITLES)
+        record = log_records()[-1]
+        assert record['cache_hits'] == 1 and record['queries'] == 0, (
+            'Проверьте, что замеры учитывают попадания в кеш каталога.'
+        )
+
+    def test_03_duplicated_queries(self):
+        from django.db import connection
+
+        from api.instrumentation import (
+            RequestStats, current_stats, install_query_wrapper
+        )
+
+        install_query_wrapper(connection=connection)
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        try:
+            with connection.cursor() as cursor:
+                for sql in ('SELECT 1', 'SELECT 2', 'SELECT 1', 'SELECT 1'):
+                    cursor.execute(sql)
+        finally:
+            current_stats.reset(token)
+        assert sum(stats.queries.values()) == 4
+        assert stats.duplicated == 2, (
+            'Проверьте, что повторы одного SQL считаются дублями.'
+        )
+
+    def test_04_async_views(self, admin_client, settings, log_records):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        from tests.test_21_async_views import reload_urls
+
+        _, titles = create_reviews(admin_client, {})
+        settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 1
+        settings.ASYNC_VIEWS = True
+        reload_urls()
+        try:
+            response = async_to_sync(AsyncClient().get)(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            )
+        finally:
+            settings.ASYNC_VIEWS = False
+            reload_urls()
+        assert response.has_header('Server-Timing')
+        assert log_records()[-1]['queries'] >= 1, (
+            'Проверьте, что учитываются запросы к базе асинхронных '
+            'представлений.'
+        )
+
+    def test_05_sampling(self, settings, monkeypatch, log_records):
+        import api.instrumentation
+
+        settings.REQUEST_INSTRUMENTATION_SAMPLE_RATE = 0.5
+        client = APIClient()
+        monkeypatch.setattr(api.instrumentation.random, 'random', lambda: 0.7)
+        assert not client.get(self.URL_TITLES).has_header('Server-Timing')
+        monkeypatch.setattr(api.instrumentation.random, 'random', lambda: 0.2)
+        assert client.get(self.URL_TITLES).has_header('Server-Timing')
+        assert len(log_records()) == 1
@@ -0,0 +1,134 @@
+import json
+import re
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_reviews
+
+SAMPLE = re.compile(r'^(\w+)(\{.*\})? (\S+)$')
+
+
+def parse(text):
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        name, labels, value = SAMPLE.match(line).groups()
+        samples[name + (labels or '')] = float(value)
+    return samples
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Metrics:
+
+    URL_METRICS = '/metrics'
+    REVIEWS_ROUTE = '/api/v1/titles/{title_id}/reviews/'
+
+    def scrape(self, client):
+        response = client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        return parse(response.content.decode())
+
+    def test_01_disabled_by_default(self, client):
+        response = client.get(self.URL_METRICS)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что без METRICS_ENABLED адрес `/metrics` недоступен.'
+        )
+
+    def test_02_route_histograms(self, admin_client, settings):
+        _, titles = create_reviews(admin_client, {})
+        settings.METRICS_ENABLED = True
+        client = APIClient()
+        counter = (
+            'yamdb_http_requests_total{method="GET",'
+            f'route="{self.REVIEWS_ROUTE}",status="200"}}'
+        )
+        count = (
+            'yamdb_http_request_duration_seconds_count{method="GET",'
+            f'route="{self.REVIEWS_ROUTE}"}}'
+        )
+        before = self.scrape(client)
+        for title in titles:
+            response = client.get(f'/api/v1/titles/{title["id"]}/reviews/')
+            assert response.status_code == HTTPStatus.OK
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/100500/')
+        after = self.scrape(client)
+        assert after[counter] - before.get(counter, 0) == len(titles), (
+            'Проверьте, что запросы считаются по шаблону маршрута, методу и '
+            'коду ответа.'
+        )
+        assert after[count] - before.get(count, 0) == len(titles)
+        infinity = count.replace('_count{', '_bucket{').replace(
+            '"}', '",le="+Inf"}'
+        )
+        assert after[infinity] == after[count], (
+            'Проверьте, что корзина +Inf гистограммы равна числу запросов.'
+        )
+        assert any(
+            name.startswith('yamdb_http_requests_total')
+            and 'route="/api/v1/titles/{pk}/"' in name
+            and 'status="404"' in name
+            for name in after
+        )
+        assert any(
+            name.startswith('yamdb_db_query_duration_seconds_count')
+            for name in after
+        ), 'Проверьте, что метрики содержат длительность запросов к базе.'
+        assert 'yamdb_db_connections{alias="default"}' in after
+        assert any(
+            name.startswith('yamdb_cache_requests_total{cache="catalogue"')
+            for name in after
+        ), 'Проверьте, что метрики содержат обращения к кешам приложения.'
+
+    def test_03_multiprocess(self, settings, tmp_path):
+        settings.METRICS_ENABLED = True
+        settings.METRICS_DIR = str(tmp_path)
+        counter = (
+            'yamdb_http_requests_total{method="GET",'
+            'route="/api/v1/categories/",status="200"}'
+        )
+        gauge = 'yamdb_db_connections{alias="default"}'
+        client = APIClient()
+        before = self.scrape(client)
+        # Файл воркера, который уже завершился.
+        (tmp_path / '999999999.json').write_text(json.dumps({
+            'pid': 999999999,
+            'counters': [[
+                'yamdb_http_requests_total',
+                [['method', 'GET'], ['route', '/api/v1/categories/'],
+                 ['status', '200']],
+                7,
+            ]],
+            'histograms': [],
+            'gauges': [['yamdb_db_connections', [['alias', 'default']], 5]],
+        }), encoding='utf-8')
+        after = self.scrape(client)
+        assert after[counter] - before.get(counter, 0) == 7, (
+            'Проверьте, что `/metrics` складывает счётчики всех процессов из '
+            'METRICS_DIR.'
+        )
+        assert after[gauge] < 5, (
+            'Проверьте, что текущие показатели завершившихся процессов не '
+            'учитываются.'
+        )
+        assert len(list(tmp_path.glob('*.json'))) == 2, (
+            'Проверьте, что процесс записывает свои значения в METRICS_DIR.'
+        )
+
+    def test_04_route_template(self):
+        from django.test import RequestFactory
+        from django.urls import resolve
+
+        from api.metrics import route_template
+
+        request = RequestFactory().get('/api/v1/titles/1/reviews/2/comments/')
+        request.resolver_match = resolve(request.path)
+        assert route_template(request) == (
+            '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        )
+        request.resolver_match = None
+        assert route_template(request) == 'unmatched'
@@ -0,0 +1,138 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def replicate(settings, tmp_path):
+    """Реплика - второй файл SQLite; replicate() копирует в него основную
+    базу."""
+    from django.db import connections
+
+    from api_yamdb.db import sqlite_database
+
+    path = tmp_path / 'replica.sqlite3'
+    connections.settings['replica'] = sqlite_database(str(path))
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+
+    def replicate():
+        connections['replica'].close()
+        primary = connections['default']
+        primary.ensure_connection()
+        replica = sqlite3.connect(path)
+        try:
+            primary.connection.backup(replica)
+        finally:
+            replica.close()
+
+    yield replicate
+    connections['replica'].close()
+    del connections['replica']
+    del connections.settings['replica']
+
+
+def reviews_count(client, title_id):
+    response = client.get(f'/api/v1/titles/{title_id}/reviews/')
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['count']
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Replicas:
+
+    def test_01_reads_from_replica(self, replicate, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        replicate()
+        Review.objects.create(title=title, author=author, text='Да', score=5)
+        client = APIClient()
+        assert reviews_count(client, title.pk) == 0, (
+            'Проверьте, что GET-запросы читают данные из реплики.'
+        )
+        replicate()
+        assert reviews_count(client, title.pk) == 1
+
+    def test_02_pin_to_primary_after_write(
+        self, replicate, user_client, admin_client, settings, monkeypatch
+    ):
+        import api.replicas
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        replicate()
+        response = user_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/', {'text': 'Да', 'score': 5}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запросы на запись идут в основную базу.'
+        )
+        assert reviews_count(user_client, title.pk) == 1, (
+            'Проверьте, что после записи клиент читает из основной базы и '
+            'видит свой отзыв.'
+        )
+        assert reviews_count(admin_client, title.pk) == 0, (
+            'Проверьте, что остальные клиенты продолжают читать из реплики.'
+        )
+        now = api.replicas.time.time()
+        monkeypatch.setattr(
+            api.replicas.time, 'time',
+            lambda: now + settings.DATABASE_REPLICA_PIN_SECONDS + 1,
+        )
+        assert reviews_count(user_client, title.pk) == 0, (
+            'Проверьте, что клиент возвращается к реплике через '
+            'DATABASE_REPLICA_PIN_SECONDS секунд.'
+        )
+
+    def test_03_writes_go_to_primary(self, replicate):
+        from django.db import router
+
+        from api.replicas import read_from_replica
+        from reviews.models import Review
+
+        token = read_from_replica.set(True)
+        try:
+            assert router.db_for_read(Review) == 'replica'
+            assert router.db_for_write(Review) == 'default'
+        finally:
+            read_from_replica.reset(token)
+        assert router.db_for_read(Review) == 'default', (
+            'Проверьте, что вне безопасных запросов чтение идёт из основной '
+            'базы.'
+        )
+
+    def test_04_catalogue_cache_filled_from_primary(self, replicate):
+        from reviews.models import Title
+
+        Title.objects.create(name='Первое', year=2000)
+        replicate()
+        Title.objects.create(name='Второе', year=2001)
+        client = APIClient()
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что кеш каталога заполняется из основной базы, а '
+            'не из отстающей реплики.'
+        )
+        replicate()
+        assert client.get('/api/v1/titles/').json()['count'] == 2
+
+    def test_05_user_cache_filled_from_primary(self, replicate, user):
+        from api.authentication import UserAccessToken
+
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {UserAccessToken.for_user(user)}'
+        )
+        replicate()
+        user.role = 'moderator'
+        user.save()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что пользователь для проверки токена читается из '
+            'основной базы: реплика ещё хранит старую роль.'
+        )
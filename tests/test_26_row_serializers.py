@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.fixtures.fixture_cache import clear_caches
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name=name, slug=slug)
+        for name, slug in (('Драма', 'drama'), ('Комедия', 'comedy'),
+                           ('Боевик', 'action'))
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        for index in range(3)
+    ]
+    titles = [
+        Title.objects.create(
+            name=f'Произведение {index}', year=2000 + index,
+            description='Описание' if index % 2 else '',
+            category=category if index % 3 else None,
+        )
+        for index in range(5)
+    ]
+    for index, title in enumerate(titles):
+        title.genre.set(genres[:index % 4])
+    reviews = [
+        Review.objects.create(
+            title=titles[0], author=author, text=f'Отзыв «{author}»',
+            score=index + 5,
+        )
+        for index, author in enumerate(authors)
+    ]
+    Title.apply_review_change(titles[0].pk, 18, 3)
+    for author in authors:
+        Comment.objects.create(
+            review=reviews[0], author=author, text='Комментарий\nс переносом'
+        )
+    return {'title_id': titles[0].pk, 'review_id': reviews[0].pk}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26RowSerializers:
+
+    URLS = (
+        '/api/v1/titles/',
+        '/api/v1/titles/?genre=drama',
+        '/api/v1/titles/{title_id}/reviews/',
+        '/api/v1/titles/{title_id}/reviews/?cursor=',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/?cursor=',
+    )
+
+    @pytest.mark.parametrize('url', URLS)
+    def test_01_same_json_as_serializers(self, url, catalogue, client,
+                                         monkeypatch):
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+
+        url = url.format(**catalogue)
+        fast = client.get(url)
+        assert fast.status_code == HTTPStatus.OK
+        assert fast.json()['results']
+        clear_caches()
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            monkeypatch.setattr(viewset, 'row_serializer_class', None)
+        regular = client.get(url)
+        assert fast.content == regular.content, (
+            f'Проверьте, что ответ `{url}` из строк values() совпадает с '
+            'ответом сериализатора байт в байт.'
+        )
+        assert fast['ETag'] == regular['ETag']
+
+    def test_02_unsupported_field(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from rest_framework import serializers
+
+        from api.row_serializers import RowSerializer
+        from reviews.models import Review
+
+        class ReviewWithTitle(serializers.ModelSerializer):
+            title = serializers.StringRelatedField()
+
+            class Meta:
+                model = Review
+                fields = ('id', 'title')
+
+        with pytest.raises(ImproperlyConfigured):
+            RowSerializer(ReviewWithTitle)
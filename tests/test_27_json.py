@@ -0,0 +1,122 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+
+DATA = {
+    'count': 2,
+    'next': None,
+    'results': [
+        {
+            'id': 1,
+            'text': 'Отзыв «с кавычками» и \\ "экранированием"\n\t\x00',
+            'separators': 'строка\u2028абзац\u2029',
+            'pub_date': datetime(2022, 5, 1, 12, 30, 15, 123456,
+                                 tzinfo=timezone.utc),
+            'date': date(2022, 5, 1),
+            'score': Decimal('7.5'),
+            'flags': [True, False, None],
+            3: 'ключ-число',
+        },
+    ] * 3,
+}
+
+
+def drf_render(data, media_type='application/json'):
+    from rest_framework.renderers import JSONRenderer
+
+    return JSONRenderer().render(data, media_type)
+
+
+@pytest.fixture(params=('orjson', 'json'))
+def renderer(request, monkeypatch):
+    from api import renderers
+
+    if request.param == 'json':
+        monkeypatch.setattr(renderers, 'orjson', None)
+    elif renderers.orjson is None:
+        pytest.skip('orjson не установлен')
+    return renderers.JSONRenderer()
+
+
+@pytest.fixture
+def users(django_user_model):
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'user{index}', email=f'user{index}@yamdb.fake',
+            bio='Биография\u2028с переносом',
+        )
+        for index in range(30)
+    )
+
+
+class Test27JSON:
+
+    @pytest.mark.parametrize('data', (
+        DATA, DATA['results'], {'results': []}, {'big': 2 ** 70},
+        'строка', 7, None,
+    ))
+    def test_01_same_bytes_as_drf(self, renderer, data):
+        assert renderer.render(data, 'application/json') == drf_render(data), (
+            'Проверьте, что api.renderers.JSONRenderer кодирует данные '
+            'байт в байт как JSONRenderer DRF.'
+        )
+
+    def test_02_indent(self, renderer):
+        media_type = 'application/json; indent=4'
+        assert renderer.render(DATA, media_type) == drf_render(
+            DATA, media_type
+        )
+
+    @pytest.mark.parametrize('data', (DATA, DATA['results'], []))
+    def test_03_stream_same_bytes(self, renderer, data, monkeypatch):
+        from api import renderers
+
+        monkeypatch.setattr(renderers, 'STREAM_BATCH_SIZE', 2)
+        chunks = list(renderer.stream(data, 'application/json'))
+        assert b''.join(chunks) == drf_render(data), (
+            'Проверьте, что потоковый вывод совпадает с обычным рендерингом.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_large_page_streamed(self, admin_client, users, settings):
+        url = '/api/v1/users/?page_size=25'
+        settings.JSON_STREAMING_THRESHOLD = 20
+        streamed = admin_client.get(url)
+        assert streamed.status_code == HTTPStatus.OK
+        assert streamed.streaming, (
+            'Проверьте, что страница от JSON_STREAMING_THRESHOLD объектов '
+            'отдаётся потоком.'
+        )
+        settings.JSON_STREAMING_THRESHOLD = 1000
+        regular = admin_client.get(url)
+        assert not regular.streaming
+        assert b''.join(streamed.streaming_content) == regular.content
+        assert streamed['ETag'] == regular['ETag']
+        assert streamed['Content-Type'] == regular['Content-Type']
+        assert len(regular.json()['results']) == 25
+        assert 'Биография' in regular.content.decode()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_page_size_limit(self, admin_client, users, settings):
+        response = admin_client.get('/api/v1/users/?page_size=100000')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == min(
+            settings.MAX_PAGE_SIZE, response.json()['count']
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_cached_lists_not_streamed(self, client, settings):
+        from reviews.models import Title
+
+        for index in range(3):
+            Title.objects.create(name=f'Произведение {index}', year=2000)
+        settings.JSON_STREAMING_THRESHOLD = 2
+        for _ in range(2):
+            response = client.get('/api/v1/titles/')
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что кешируемые списки не отдаются потоком.'
+            )
+            assert not response.streaming
+            assert response.json()['count'] == 3
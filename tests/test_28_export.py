@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+
+DATA_DIR = 'api_yamdb/static/data'
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    from reviews.models import Category, Comment, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    titles = [
+        Title.objects.create(
+            name=f'Произведение, «{index}»', year=2000 + index,
+            category=category if index else None,
+        )
+        for index in range(5)
+    ]
+    author = django_user_model.objects.create_user(
+        username='author', email='author@yamdb.fake'
+    )
+    review = Review.objects.create(
+        title=titles[0], author=author, text='Отзыв\nв две строки', score=8
+    )
+    Comment.objects.create(review=review, author=author, text='Комментарий')
+    return titles
+
+
+def body(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком.'
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Export:
+
+    @pytest.mark.parametrize('name, filename', (
+        ('titles', 'titles.csv'),
+        ('reviews', 'review.csv'),
+        ('comments', 'comments.csv'),
+    ))
+    def test_01_csv_layout(self, admin_client, catalogue, name, filename):
+        response = admin_client.get(f'/api/v1/export/{name}.csv')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        rows = list(csv.reader(io.StringIO(body(response), newline='')))
+        with open(f'{DATA_DIR}/{filename}', encoding='utf-8') as csv_file:
+            header = next(csv.reader(csv_file))
+        assert rows[0] == header, (
+            f'Проверьте, что столбцы `{name}.csv` совпадают с '
+            f'static/data/{filename}.'
+        )
+        assert len(rows) > 1
+
+    def test_02_titles_csv(self, admin_client, catalogue, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        response = admin_client.get('/api/v1/export/titles.csv')
+        chunks = list(response.streaming_content)
+        assert len(chunks) > 1
+        rows = list(csv.DictReader(io.StringIO(
+            b''.join(chunks).decode(), newline=''
+        )))
+        assert [row['id'] for row in rows] == [
+            str(title.pk) for title in catalogue
+        ]
+        assert rows[0]['name'] == 'Произведение, «0»'
+        assert rows[0]['category'] == ''
+        assert rows[1]['category'] == str(catalogue[1].category_id)
+
+    def test_03_reviews_ndjson(self, admin_client, catalogue):
+        from reviews.models import Review
+
+        response = admin_client.get('/api/v1/export/reviews.ndjson')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = body(response).splitlines()
+        review = Review.objects.get()
+        assert [json.loads(line) for line in lines] == [{
+            'id': review.pk,
+            'title_id': review.title_id,
+            'text': 'Отзыв\nв две строки',
+            'author': review.author_id,
+            'score': 8,
+            'pub_date': review.pub_date.isoformat(
+                timespec='milliseconds'
+            ).replace('+00:00', 'Z'),
+        }]
+
+    def test_04_updated_since(self, admin_client, catalogue):
+        from reviews.models import Title
+
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        assert len(body(response).splitlines()) == len(catalogue)
+        Title.objects.filter(pk=catalogue[2].pk).update(
+            updated_at=catalogue[2].updated_at + timedelta(days=1)
+        )
+        since = (catalogue[2].updated_at + timedelta(hours=1)).isoformat()
+        response = admin_client.get(
+            '/api/v1/export/titles.ndjson', {'updated_since': since}
+        )
+        assert [
+            json.loads(line)['id'] for line in body(response).splitlines()
+        ] == [catalogue[2].pk], (
+            'Проверьте, что updated_since оставляет только изменённые строки.'
+        )
+
+    def test_05_watermark_overlap(self, admin_client, catalogue, settings):
+        from django.utils import timezone
+        from django.utils.dateparse import parse_datetime
+
+        from reviews.models import Title
+
+        settings.EXPORT_WATERMARK_OVERLAP = 60
+        now = timezone.now()
+        Title.objects.update(updated_at=now - timedelta(hours=1))
+        response = admin_client.get('/api/v1/export/titles.csv')
+        body(response)
+        watermark = response['X-Next-Updated-Since']
+        assert parse_datetime(watermark) <= now - timedelta(seconds=59)
+        # Транзакция, зафиксированная после выгрузки, с updated_at до её
+        # начала.
+        Title.objects.filter(pk=catalogue[1].pk).update(
+            updated_at=now - timedelta(seconds=30)
+        )
+        response = admin_client.get(
+            '/api/v1/export/titles.csv', {'updated_since': watermark}
+        )
+        rows = list(csv.DictReader(io.StringIO(body(response), newline='')))
+        assert [row['id'] for row in rows] == [str(catalogue[1].pk)], (
+            'Проверьте, что X-Next-Updated-Since перекрывает строки, '
+            'изменённые незадолго до начала выгрузки.'
+        )
+
+    @pytest.mark.parametrize('url, expected', (
+        ('/api/v1/export/titles.csv?updated_since=вчера',
+         HTTPStatus.BAD_REQUEST),
+        ('/api/v1/export/titles.csv?updated_since=2022-02-30',
+         HTTPStatus.BAD_REQUEST),
+        ('/api/v1/export/users.csv', HTTPStatus.NOT_FOUND),
+        ('/api/v1/export/titles.xml', HTTPStatus.NOT_FOUND),
+    ))
+    def test_06_invalid_requests(self, admin_client, url, expected):
+        assert admin_client.get(url).status_code == expected
+
+    def test_07_admin_only(self, client, user_client, moderator_client):
+        url = '/api/v1/export/reviews.csv'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        for other in (user_client, moderator_client):
+            assert other.get(url).status_code == HTTPStatus.FORBIDDEN
+
+    def test_08_refused_under_asgi(self, token_admin):
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncClient
+
+        response = async_to_sync(AsyncClient().get)(
+            '/api/v1/export/titles.csv',
+            authorization=f'Bearer {token_admin["access"]}',
+        )
+        assert response.status_code == HTTPStatus.NOT_IMPLEMENTED, (
+            'Проверьте, что под ASGI выгрузка отклоняется до начала ответа.'
+        )
@@ -0,0 +1,193 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture
+def titles():
+    from reviews.models import Title
+
+    return [
+        Title.objects.create(name=f'Произведение {index}', year=2000)
+        for index in range(3)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29Batch:
+
+    def test_01_reviews(self, user_client, user, titles):
+        from reviews.models import Review, Title
+        from search.models import SearchDocument
+
+        Review.objects.create(
+            title=titles[2], author=user, text='Старый отзыв', score=5
+        )
+        items = [
+            {'title': titles[0].pk, 'text': 'Первый отзыв', 'score': 10},
+            {'title': titles[1].pk, 'text': 'Второй отзыв', 'score': 7},
+            {'title': titles[0].pk, 'text': 'Повтор в пакете', 'score': 1},
+            {'title': titles[2].pk, 'text': 'Повтор в базе', 'score': 1},
+            {'title': titles[1].pk, 'text': 'Оценка вне шкалы', 'score': 11},
+            {'title': 100500, 'text': 'Нет произведения', 'score': 5},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(
+                '/api/v1/reviews/batch/', items, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.BAD_REQUEST, HTTPStatus.BAD_REQUEST,
+            HTTPStatus.NOT_FOUND,
+        ], 'Проверьте статусы элементов пакета отзывов.'
+        assert 'score' in results[4]['errors']
+        for result, item in zip(results[:2], items):
+            review = Review.objects.get(pk=result['data']['id'])
+            assert review.text == item['text']
+            assert result['data']['title'] == review.title_id
+            assert result['data']['author'] == user.username
+            assert SearchDocument.objects.filter(
+                kind='review', object_id=review.pk
+            ).exists(), 'Проверьте, что новые отзывы попадают в поиск.'
+        assert Review.objects.count() == 3
+        stats = Title.objects.in_bulk([titles[0].pk, titles[1].pk])
+        assert (stats[titles[0].pk].rating, stats[titles[0].pk].reviews_count,
+                stats[titles[1].pk].rating) == (10, 1, 7)
+        updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        inserts = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_review"')
+        ]
+        assert (len(updates), len(inserts)) == (2, 1), (
+            'Проверьте, что статистика обновляется одним запросом на '
+            'произведение, а отзывы вставляются одним запросом.'
+        )
+
+    def test_02_comments(self, user_client, user, titles):
+        from reviews.models import Comment, Review
+
+        review = Review.objects.create(
+            title=titles[0], author=user, text='Отзыв', score=5
+        )
+        items = [
+            {'title': titles[0].pk, 'review': review.pk, 'text': 'Первый'},
+            {'title': titles[0].pk, 'review': review.pk, 'text': 'Второй'},
+            {'title': titles[1].pk, 'review': review.pk, 'text': 'Чужой'},
+            {'title': titles[0].pk, 'review': review.pk, 'text': ''},
+        ]
+        response = user_client.post(
+            '/api/v1/comments/batch/', items, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED, HTTPStatus.NOT_FOUND,
+            HTTPStatus.BAD_REQUEST,
+        ]
+        assert [
+            Comment.objects.get(pk=result['data']['id']).text
+            for result in results[:2]
+        ] == ['Первый', 'Второй'], (
+            'Проверьте, что в ответе id созданных комментариев.'
+        )
+        assert results[0]['data']['review'] == review.pk
+
+    @pytest.mark.parametrize('data', ([], {'title': 1}, [{}] * 101))
+    def test_03_invalid_batch(self, user_client, data):
+        response = user_client.post(
+            '/api/v1/reviews/batch/', data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_auth_required(self, client, titles):
+        response = client.post(
+            '/api/v1/reviews/batch/',
+            [{'title': titles[0].pk, 'text': 'Отзыв', 'score': 5}],
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    @pytest.mark.parametrize('field', ('title', 'review'))
+    @pytest.mark.parametrize('value', (10 ** 30, 0, -1))
+    def test_05_id_out_of_range(self, user_client, titles, field, value):
+        url, item = {
+            'title': ('/api/v1/reviews/batch/', {
+                'title': value, 'text': 'Отзыв', 'score': 5
+            }),
+            'review': ('/api/v1/comments/batch/', {
+                'title': titles[0].pk, 'review': value, 'text': 'Текст'
+            }),
+        }[field]
+        response = user_client.post(url, [item], format='json')
+        assert response.status_code == HTTPStatus.OK
+        result, = response.json()
+        assert result['status'] == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{field}` вне диапазона id отклоняется в '
+            'результате элемента.'
+        )
+        assert field in result['errors']
+
+    @pytest.fixture
+    def throttling(self, settings):
+        settings.THROTTLING_ENABLED = True
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'write_user': '1/minute',
+                'write_batch_user': '3/minute',
+            },
+        }
+
+    def test_06_throttled_per_item(self, user_client, titles, throttling):
+        url = '/api/v1/reviews/batch/'
+        items = [
+            {'title': title.pk, 'text': 'Отзыв', 'score': 5}
+            for title in titles
+        ]
+        response = user_client.post(url, items[:2], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что пакеты не расходуют лимит одиночной записи.'
+        )
+        response = user_client.post(url, items[2:] * 2, format='json')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что пакет расходует лимит пакетной записи по числу '
+            'элементов.'
+        )
+        response = user_client.post(url, items[2:], format='json')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_07_batch_above_rate(self, user_client, titles, throttling):
+        url = '/api/v1/reviews/batch/'
+        items = [
+            {'title': titles[0].pk, 'text': 'Отзыв', 'score': 5}
+        ] * 4
+        response = user_client.post(url, items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пакет больше лимита пакетной записи отклоняется '
+            'со статусом 400, а не 429.'
+        )
+        assert '3' in str(response.json()), (
+            'Проверьте, что ответ называет наибольший размер пакета.'
+        )
+        response = user_client.post(url, items[:3], format='json')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что отклонённый пакет не расходует лимит.'
+        )
+
+    def test_08_max_items_capped_by_rate(self, throttling, settings):
+        from api.batch import max_items
+
+        settings.BATCH_WRITE_MAX_ITEMS = 100
+        assert max_items() == 3, (
+            'Проверьте, что размер пакета не превышает лимит пакетной '
+            'записи.'
+        )
+        settings.THROTTLING_ENABLED = False
+        assert max_items() == 100